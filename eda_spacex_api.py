@@ -5,12 +5,20 @@ Author: Camilo Medina
 Description: Generate scatter plot analysis with API data and fallback to realistic sample data
 """
 
+import os
+import sys
 import requests
 import pandas as pd
+import matplotlib
+# Headless runs (HEADLESS set or output not a terminal) only need the PNGs: skip GUI backend setup
+if os.environ.get('HEADLESS') or not sys.stdout.isatty():
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import seaborn as sns
 import numpy as np
 from datetime import datetime
+from spacex_client import get_launches
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -25,16 +33,14 @@ def fetch_spacex_data():
     print("1. Fetching SpaceX launch data...")
     
     try:
-        # Fetch launches data with timeout
-        launches_url = "https://api.spacexdata.com/v4/launches"
-        launches_response = requests.get(launches_url, timeout=30)
-        launches_response.raise_for_status()
-        launches_data = launches_response.json()
+        # Fetch launches data with timeout (served from the on-disk cache when fresh)
+        launches_data = get_launches(timeout=30)
         
         print(f"   - Successfully fetched {len(launches_data)} launches")
         return launches_data
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError: malformed JSON body (the orjson/ujson/json decoders do not raise RequestException)
         print(f"   - Error fetching data: {e}")
         print("   - Will use sample data instead")
         return None
@@ -55,44 +61,47 @@ def create_realistic_sample_data():
         'VAFB SLC 4E'
     ]
     
-    # Generate realistic data
-    np.random.seed(42)
-    n_launches = 120
-    
-    data = []
+    # Mean/std payload mass per launch site (heavier payloads from KSC, lighter from VAFB)
+    sites_arr = np.array(launch_sites)
+    means = np.array([6000 if 'KSC' in s else 4000 if 'VAFB' in s else 5000 for s in launch_sites])
+    stds = np.array([2000 if 'KSC' in s else 1000 if 'VAFB' in s else 1500 for s in launch_sites])
     
-    for i in range(n_launches):
-        # Select launch site
-        launch_site = np.random.choice(launch_sites)
-        
-        # Generate payload mass based on launch site
-        if 'CCAFS' in launch_site:
-            payload_mass = np.random.normal(5000, 1500)
-        elif 'KSC' in launch_site:
-            payload_mass = np.random.normal(6000, 2000)
-        elif 'VAFB' in launch_site:
-            payload_mass = np.random.normal(4000, 1000)
-        else:
-            payload_mass = np.random.normal(5000, 1500)
-        
-        # Ensure positive values
-        payload_mass = max(1000, int(payload_mass))
-        
-        # Generate success rate based on payload mass (heavier = more challenging)
-        success_prob = 0.9 - (payload_mass - 3000) / 10000  # Adjust based on mass
-        success_prob = max(0.6, min(0.95, success_prob))  # Keep between 60% and 95%
-        success = np.random.random() < success_prob
-        
-        data.append({
-            'FlightNumber': i + 1,
-            'LaunchSite': launch_site,
-            'PayloadMass': payload_mass,
-            'Success': success,
-            'Date': f"2020-{np.random.randint(1,13):02d}-{np.random.randint(1,29):02d}",
-            'Rocket': 'Falcon 9'
-        })
+    # Generate realistic data, drawing every column in one vectorized call
+    rng = np.random.default_rng(42)
+    n_launches = 120
     
-    df = pd.DataFrame(data)
+    idx = rng.integers(0, len(sites_arr), n_launches)
+    site_col = sites_arr[idx]
+    
+    # Draw each site's payloads as one contiguous block with scalar mean/std,
+    # then scatter the blocks back to launch order via the sorting permutation
+    counts = np.bincount(idx, minlength=len(sites_arr))
+    order = np.argsort(idx, kind='stable')
+    draws = np.concatenate([rng.normal(means[k], stds[k], counts[k]) for k in range(len(sites_arr))])
+    payload_raw = np.empty(n_launches)
+    payload_raw[order] = draws
+    
+    # Ensure positive values
+    payload = np.maximum(1000, payload_raw.astype(np.int64))
+    
+    # Generate success rate based on payload mass (heavier = more challenging)
+    success_prob = np.clip(0.9 - (payload - 3000) / 10000, 0.6, 0.95)  # Keep between 60% and 95%
+    success = rng.random(n_launches) < success_prob
+    
+    months = rng.integers(1, 13, n_launches)
+    days = rng.integers(1, 29, n_launches)
+    date_col = [f"2020-{m:02d}-{d:02d}" for m, d in zip(months, days)]
+    
+    # Columnar build from typed arrays; LaunchSite as categorical for cheap grouping
+    df = pd.DataFrame({
+        'FlightNumber': np.arange(1, n_launches + 1, dtype=np.int32),
+        'LaunchSite': pd.Categorical(site_col),
+        'PayloadMass': payload.astype(np.int32),
+        'Success': success,
+        'Date': date_col,
+        'Rocket': 'Falcon 9'
+    })
+    df['Rocket'] = df['Rocket'].astype('category')
     
     print(f"   - Created {len(df)} sample launches")
     print(f"   - Launch sites: {df['LaunchSite'].nunique()}")
@@ -110,53 +119,51 @@ def process_api_data(launches_data):
     if not launches_data:
         return None
     
-    payload_data = []
-    
-    for launch in launches_data:
-        # Extract basic information
-        flight_number = launch.get('flight_number', 0)
-        success = launch.get('success', False)
-        launch_date = launch.get('date_utc', '')
-        rocket = launch.get('rocket', {})
-        launchpad = launch.get('launchpad', {})
-        payloads = launch.get('payloads', [])
-        
-        # Get rocket name
-        rocket_name = rocket.get('name', 'Unknown') if isinstance(rocket, dict) else str(rocket)
-        
-        # Get launchpad name
-        launchpad_name = launchpad.get('name', 'Unknown') if isinstance(launchpad, dict) else str(launchpad)
-        
-        # Only process Falcon 9 launches
-        if 'Falcon 9' in rocket_name:
-            # Calculate total payload mass
-            total_payload_mass = 0
-            
-            for payload in payloads:
-                if isinstance(payload, dict):
-                    mass_kg = payload.get('mass_kg')
-                    if mass_kg and mass_kg > 0:
-                        total_payload_mass += mass_kg
-                elif isinstance(payload, str):
-                    # If payload is just an ID, we can't get mass
-                    continue
-            
-            # Include launches with or without payload data
-            if total_payload_mass > 0:
-                payload_data.append({
-                    'FlightNumber': flight_number,
-                    'LaunchSite': launchpad_name,
-                    'PayloadMass': total_payload_mass,
-                    'Success': success,
-                    'Date': launch_date,
-                    'Rocket': rocket_name
-                })
-    
-    if len(payload_data) == 0:
+    # Flatten nested rocket/launchpad objects into 'rocket.name' / 'launchpad.name' columns
+    launches = pd.json_normalize(launches_data)
+    
+    def nested_name(column):
+        """Name of a nested object column, falling back to the raw value (e.g. an ID)"""
+        names = launches.get(f'{column}.name', pd.Series(np.nan, index=launches.index))
+        raw = launches.get(column, pd.Series('Unknown', index=launches.index))
+        return names.fillna(raw).fillna('Unknown').astype(str)
+    
+    launches['RocketName'] = nested_name('rocket')
+    launches['LaunchSiteName'] = nested_name('launchpad')
+    
+    # Only process Falcon 9 launches
+    f9 = launches[launches['RocketName'].str.contains('Falcon 9', regex=False)]
+    if 'payloads' not in f9:
+        f9 = f9.assign(payloads=[[] for _ in range(len(f9))])
+    
+    # Calculate total payload mass per launch; payloads given only as IDs carry no mass
+    payloads = f9['payloads'].explode()
+    payloads = payloads[payloads.map(lambda payload: isinstance(payload, dict))]
+    masses = pd.json_normalize(payloads.tolist()).reindex(columns=['mass_kg'])
+    masses.index = payloads.index
+    masses = masses['mass_kg'].where(masses['mass_kg'] > 0)
+    total_payload_mass = masses.groupby(level=0).sum().reindex(f9.index, fill_value=0)
+    
+    # Include launches with or without payload data
+    has_payload = total_payload_mass > 0
+    if not has_payload.any():
         print("   - No payload data found in API")
         return None
     
-    df = pd.DataFrame(payload_data)
+    f9 = f9[has_payload]
+    df = pd.DataFrame({
+        'FlightNumber': f9.get('flight_number', 0),
+        'LaunchSite': f9['LaunchSiteName'],
+        'PayloadMass': total_payload_mass[has_payload],
+        'Success': f9.get('success', False),
+        'Date': f9.get('date_utc', ''),
+        'Rocket': f9['RocketName']
+    }).reset_index(drop=True)
+    
+    # Few distinct values: categorical codes make later grouping/comparisons cheap
+    df['LaunchSite'] = df['LaunchSite'].astype('category')
+    df['Rocket'] = df['Rocket'].astype('category')
+    
     print(f"   - Processed {len(df)} Falcon 9 launches with payload data")
     print(f"   - Launch sites: {df['LaunchSite'].nunique()}")
     print(f"   - Payload mass range: {df['PayloadMass'].min():.0f} - {df['PayloadMass'].max():.0f} kg")
@@ -164,7 +171,17 @@ def process_api_data(launches_data):
     
     return df
 
-def create_payload_vs_launch_site_plot(df):
+def build_site_colors(df):
+    """
+    Map each launch site to one viridis color, shared by every plot
+    """
+    if isinstance(df['LaunchSite'].dtype, pd.CategoricalDtype):
+        sites = df['LaunchSite'].cat.remove_unused_categories().cat.categories
+    else:
+        sites = df['LaunchSite'].unique()
+    return dict(zip(sites, plt.cm.viridis(np.linspace(0, 1, len(sites)))))
+
+def create_payload_vs_launch_site_plot(df, site_colors=None):
     """
     Create the main scatter plot: Payload Mass vs. Launch Site
     """
@@ -175,42 +192,58 @@ def create_payload_vs_launch_site_plot(df):
         return
     
     # Set up the plot
-    plt.figure(figsize=(16, 10))
-    
-    # Get unique launch sites
-    sites = df['LaunchSite'].unique()
-    colors = plt.cm.viridis(np.linspace(0, 1, len(sites)))
-    
-    # Create scatter plot for each launch site
-    for i, site in enumerate(sites):
-        site_data = df[df['LaunchSite'] == site]
-        
-        # Separate success and failure
-        success_data = site_data[site_data['Success'] == True]
-        failure_data = site_data[site_data['Success'] == False]
-        
-        # Plot success markers (green circles)
-        plt.scatter(success_data['PayloadMass'], 
-                   [i] * len(success_data), 
-                   c=colors[i], 
+    fig = plt.figure(figsize=(16, 10))
+    
+    # Get launch sites and their colors
+    if site_colors is None:
+        site_colors = build_site_colors(df)
+    sites = list(site_colors)
+    colors = np.array(list(site_colors.values()))
+    
+    # Map every launch to its site row once, then draw all successes and all failures
+    # with one scatter call each using per-point colors
+    site_to_y = {site: i for i, site in enumerate(sites)}
+    y = df['LaunchSite'].map(site_to_y).to_numpy(dtype=np.int64)
+    payload = df['PayloadMass'].to_numpy()
+    
+    # Partition by outcome once; both scatter calls and the legend reuse these masks
+    success_mask = (df['Success'] == True).to_numpy()
+    failure_mask = (df['Success'] == False).to_numpy()
+    failure_rows = set(np.unique(y[failure_mask]).tolist())
+    
+    # Plot success markers (green circles)
+    plt.scatter(payload[success_mask], 
+               y[success_mask], 
+               c=colors[y[success_mask]], 
+               s=150, 
+               alpha=0.8, 
+               marker='o',
+               edgecolors='darkgreen',
+               linewidth=2,
+               rasterized=True)
+    
+    # Plot failure markers (red X)
+    if failure_mask.any():
+        plt.scatter(payload[failure_mask], 
+                   y[failure_mask], 
+                   c=colors[y[failure_mask]], 
                    s=150, 
                    alpha=0.8, 
-                   marker='o',
-                   label=f'{site} (Success)',
-                   edgecolors='darkgreen',
-                   linewidth=2)
-        
-        # Plot failure markers (red X)
-        if len(failure_data) > 0:
-            plt.scatter(failure_data['PayloadMass'], 
-                       [i] * len(failure_data), 
-                       c=colors[i], 
-                       s=150, 
-                       alpha=0.8, 
-                       marker='X',
-                       label=f'{site} (Failure)',
-                       edgecolors='darkred',
-                       linewidth=2)
+                   marker='X',
+                   edgecolors='darkred',
+                   linewidth=2,
+                   rasterized=True)
+    
+    # Legend entries per site via proxy artists
+    legend_handles = []
+    for i, site in enumerate(sites):
+        legend_handles.append(Line2D([], [], linestyle='', marker='o', markersize=12, alpha=0.8,
+                                     markerfacecolor=site_colors[site], markeredgecolor='darkgreen',
+                                     markeredgewidth=2, label=f'{site} (Success)'))
+        if i in failure_rows:
+            legend_handles.append(Line2D([], [], linestyle='', marker='X', markersize=12, alpha=0.8,
+                                         markerfacecolor=site_colors[site], markeredgecolor='darkred',
+                                         markeredgewidth=2, label=f'{site} (Failure)'))
     
     # Customize the plot
     plt.xlabel('Payload Mass (kg)', fontsize=14, fontweight='bold')
@@ -225,7 +258,7 @@ def create_payload_vs_launch_site_plot(df):
     plt.grid(True, alpha=0.3, linestyle='--')
     
     # Add legend
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
+    plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
     
     # Add annotations for key insights
     max_payload = df['PayloadMass'].max()
@@ -246,17 +279,19 @@ def create_payload_vs_launch_site_plot(df):
     
     plt.tight_layout()
     
-    # Save the plot
+    # Save the plot (scatter markers are rasterized, axes and text stay vector)
     output_filename = 'spacex_payload_vs_launch_site.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight')
+    plt.savefig(output_filename, dpi=200, bbox_inches='tight')
     print(f"   - Plot saved as: {output_filename}")
     
-    # Show the plot
-    plt.show()
+    # Show the plot (only with an interactive backend) and release the figure
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
     
     return output_filename
 
-def create_payload_analysis_plots(df):
+def create_payload_analysis_plots(df, site_colors=None):
     """
     Create additional payload analysis visualizations
     """
@@ -271,13 +306,18 @@ def create_payload_analysis_plots(df):
     fig.suptitle('SpaceX Payload Analysis - Comprehensive EDA', fontsize=18, fontweight='bold')
     
     # 1. Payload Mass Distribution by Launch Site
-    sites = df['LaunchSite'].unique()
-    colors = plt.cm.viridis(np.linspace(0, 1, len(sites)))
-    
-    for i, site in enumerate(sites):
-        site_data = df[df['LaunchSite'] == site]
-        axes[0, 0].hist(site_data['PayloadMass'], alpha=0.7, label=site, 
-                       bins=15, color=colors[i], edgecolor='black')
+    # Group once and pull each site's rows in the shared color order
+    if site_colors is None:
+        site_colors = build_site_colors(df)
+    grouped = df.groupby('LaunchSite', sort=False, observed=True)
+    sites = list(site_colors)
+    site_groups = [grouped.get_group(site) for site in sites]
+    
+    # One hist call over all sites, binned against shared edges
+    bins = np.linspace(df['PayloadMass'].min(), df['PayloadMass'].max(), 16)
+    data_per_site = [site_data['PayloadMass'].to_numpy() for site_data in site_groups]
+    axes[0, 0].hist(data_per_site, bins=bins, label=sites, color=list(site_colors.values()),
+                   alpha=0.7, edgecolor='black')
     
     axes[0, 0].set_title('Payload Mass Distribution by Launch Site', fontweight='bold', fontsize=14)
     axes[0, 0].set_xlabel('Payload Mass (kg)', fontsize=12)
@@ -286,8 +326,11 @@ def create_payload_analysis_plots(df):
     axes[0, 0].grid(True, alpha=0.3)
     
     # 2. Success Rate by Payload Mass Range
-    df['PayloadRange'] = pd.cut(df['PayloadMass'], bins=5, labels=['Very Light', 'Light', 'Medium', 'Heavy', 'Very Heavy'])
-    success_by_payload = df.groupby('PayloadRange')['Success'].mean()
+    mass_min, mass_max = df['PayloadMass'].min(), df['PayloadMass'].max()
+    edges = np.linspace(mass_min, mass_max, 6) if mass_max > mass_min else 5
+    df['PayloadRange'] = pd.cut(df['PayloadMass'], bins=edges, include_lowest=True, ordered=True,
+                                labels=['Very Light', 'Light', 'Medium', 'Heavy', 'Very Heavy'])
+    success_by_payload = df.groupby('PayloadRange', observed=True)['Success'].mean()
     
     bars = axes[0, 1].bar(range(len(success_by_payload)), success_by_payload.values, 
                           color='lightcoral', alpha=0.8, edgecolor='black')
@@ -306,7 +349,7 @@ def create_payload_analysis_plots(df):
                        f'{height:.1%}', ha='center', va='bottom', fontweight='bold')
     
     # 3. Box Plot: Payload Mass by Launch Site
-    df.boxplot(column='PayloadMass', by='LaunchSite', ax=axes[1, 0])
+    axes[1, 0].boxplot(data_per_site, tick_labels=sites)
     axes[1, 0].set_title('Payload Mass Distribution (Box Plot)', fontweight='bold', fontsize=14)
     axes[1, 0].set_xlabel('Launch Site', fontsize=12)
     axes[1, 0].set_ylabel('Payload Mass (kg)', fontsize=12)
@@ -314,10 +357,10 @@ def create_payload_analysis_plots(df):
     axes[1, 0].tick_params(axis='x', rotation=45)
     
     # 4. Scatter Plot: Payload Mass vs Success (colored by Launch Site)
-    for i, site in enumerate(sites):
-        site_data = df[df['LaunchSite'] == site]
+    for site, site_data in zip(sites, site_groups):
         axes[1, 1].scatter(site_data['PayloadMass'], site_data['Success'], 
-                          c=colors[i], label=site, alpha=0.7, s=80, edgecolors='black')
+                          c=site_colors[site], label=site, alpha=0.7, s=80, edgecolors='black',
+                          rasterized=True)
     
     axes[1, 1].set_title('Payload Mass vs Landing Success', fontweight='bold', fontsize=14)
     axes[1, 1].set_xlabel('Payload Mass (kg)', fontsize=12)
@@ -326,45 +369,61 @@ def create_payload_analysis_plots(df):
     axes[1, 1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('spacex_payload_comprehensive_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig('spacex_payload_comprehensive_analysis.png', dpi=200, bbox_inches='tight')
     print("   - Comprehensive payload analysis saved as: spacex_payload_comprehensive_analysis.png")
-    plt.show()
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
 
 def generate_payload_statistics(df):
     """
     Generate detailed statistics for payload analysis
     """
-    print("\n5. Payload Statistics:")
+    lines = ["\n5. Payload Statistics:"]
     
     if df is None or len(df) == 0:
-        print("   - No data available for statistics")
+        lines.append("   - No data available for statistics")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
     
-    print(f"   - Total Launches with Payload Data: {len(df)}")
-    print(f"   - Launch Sites: {df['LaunchSite'].nunique()}")
-    print(f"   - Overall Success Rate: {df['Success'].mean():.1%}")
-    print(f"   - Payload Mass Statistics:")
-    print(f"     * Mean: {df['PayloadMass'].mean():.0f} kg")
-    print(f"     * Median: {df['PayloadMass'].median():.0f} kg")
-    print(f"     * Range: {df['PayloadMass'].min():.0f} - {df['PayloadMass'].max():.0f} kg")
-    print(f"     * Standard Deviation: {df['PayloadMass'].std():.0f} kg")
-    
-    print("\n   - Launch Site Statistics:")
-    for site in df['LaunchSite'].unique():
-        site_data = df[df['LaunchSite'] == site]
-        success_rate = site_data['Success'].mean()
-        mean_payload = site_data['PayloadMass'].mean()
-        print(f"     * {site}:")
-        print(f"       - Launches: {len(site_data)}")
-        print(f"       - Success Rate: {success_rate:.1%}")
-        print(f"       - Mean Payload: {mean_payload:.0f} kg")
-        print(f"       - Payload Range: {site_data['PayloadMass'].min():.0f} - {site_data['PayloadMass'].max():.0f} kg")
-    
-    print("\n6. Key Insights:")
-    print("   - Launch sites show different payload mass capabilities")
-    print("   - Heavier payloads may correlate with different success rates")
-    print("   - Payload mass distribution varies significantly by launch site")
-    print("   - Realistic data patterns based on SpaceX operations")
+    lines += [
+        f"   - Total Launches with Payload Data: {len(df)}",
+        f"   - Launch Sites: {df['LaunchSite'].nunique()}",
+        f"   - Overall Success Rate: {df['Success'].mean():.1%}",
+        f"   - Payload Mass Statistics:",
+        f"     * Mean: {df['PayloadMass'].mean():.0f} kg",
+        f"     * Median: {df['PayloadMass'].median():.0f} kg",
+        f"     * Range: {df['PayloadMass'].min():.0f} - {df['PayloadMass'].max():.0f} kg",
+        f"     * Standard Deviation: {df['PayloadMass'].std():.0f} kg",
+        "\n   - Launch Site Statistics:",
+    ]
+    
+    site_stats = df.groupby('LaunchSite', sort=False, observed=True).agg(
+        launches=('PayloadMass', 'size'),
+        success_rate=('Success', 'mean'),
+        mean_payload=('PayloadMass', 'mean'),
+        min_payload=('PayloadMass', 'min'),
+        max_payload=('PayloadMass', 'max')
+    )
+    for site in site_stats.itertuples():
+        lines += [
+            f"     * {site.Index}:",
+            f"       - Launches: {site.launches}",
+            f"       - Success Rate: {site.success_rate:.1%}",
+            f"       - Mean Payload: {site.mean_payload:.0f} kg",
+            f"       - Payload Range: {site.min_payload:.0f} - {site.max_payload:.0f} kg",
+        ]
+    
+    lines += [
+        "\n6. Key Insights:",
+        "   - Launch sites show different payload mass capabilities",
+        "   - Heavier payloads may correlate with different success rates",
+        "   - Payload mass distribution varies significantly by launch site",
+        "   - Realistic data patterns based on SpaceX operations",
+    ]
+    
+    # Emit the whole report in one write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     print("🚀 SpaceX Payload vs. Launch Site Analysis - Enhanced")
@@ -385,11 +444,14 @@ if __name__ == "__main__":
         df = create_realistic_sample_data()
     
     if df is not None and len(df) > 0:
+        # One site -> color mapping shared by every plot
+        site_colors = build_site_colors(df)
+        
         # Create main scatter plot
-        plot_filename = create_payload_vs_launch_site_plot(df)
+        plot_filename = create_payload_vs_launch_site_plot(df, site_colors)
         
         # Create additional analysis plots
-        create_payload_analysis_plots(df)
+        create_payload_analysis_plots(df, site_colors)
         
         # Generate statistics
         generate_payload_statistics(df)
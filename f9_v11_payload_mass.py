@@ -3,11 +3,17 @@ SpaceX EDA - Average Payload Mass by F9 v1.1
 Calculate the average payload mass carried by booster version F9 v1.1
 """
 
-import requests
+import os
+import sys
 import pandas as pd
+import matplotlib
+# Headless runs (HEADLESS set or output not a terminal) cannot show windows: skip GUI backend setup
+if os.environ.get('HEADLESS') or not sys.stdout.isatty():
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from spacex_client import obtener_datos_completos, obtener_por_id
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,108 +21,38 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_payloads():
-    """
-    Obtiene datos de payloads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/payloads')
-        response.raise_for_status()
-        payloads = response.json()
-        return {payload['id']: payload for payload in payloads}
-    except:
-        return {}
-
-def obtener_datos_rockets():
-    """
-    Obtiene datos de rockets desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/rockets')
-        response.raise_for_status()
-        rockets = response.json()
-        return {rocket['id']: rocket for rocket in rockets}
-    except:
-        return {}
-
-def calcular_payload_f9_v11(launches):
+def calcular_payload_f9_v11(launches, payloads_data=None, rockets_data=None):
     """
     Calcula la masa promedio de payloads para F9 v1.1
     """
     print("Calculando masa promedio de payloads para F9 v1.1...")
     
-    # Obtener datos de payloads y rockets
-    print("Obteniendo datos de payloads y rockets...")
-    payloads_data = obtener_datos_payloads()
-    rockets_data = obtener_datos_rockets()
+    # Obtener datos de payloads y rockets si no se recibieron ya
+    if payloads_data is None or rockets_data is None:
+        print("Obteniendo datos de payloads y rockets...")
+        payloads_data = obtener_por_id('payloads') if payloads_data is None else payloads_data
+        rockets_data = obtener_por_id('rockets') if rockets_data is None else rockets_data
     
     # Convertir a DataFrame
     df = pd.DataFrame(launches)
     
-    # Extraer información de payloads
-    def extraer_payload_info(payload_ids):
-        """Extrae información de todos los payloads"""
-        if not payload_ids:
-            return []
-        
-        payload_info = []
-        for payload_id in payload_ids:
-            if payload_id in payloads_data:
-                payload = payloads_data[payload_id]
-                payload_info.append({
-                    'mass_kg': payload.get('mass_kg', 0),
-                    'name': payload.get('name', 'Unknown')
-                })
-        return payload_info
-    
-    # Extraer información de rockets
-    def extraer_rocket_info(rocket_id):
-        """Extrae información del rocket"""
-        if rocket_id and rocket_id in rockets_data:
-            return rockets_data[rocket_id]
-        return None
-    
-    # Crear nuevas columnas
-    df['payload_info'] = df['payloads'].apply(extraer_payload_info)
-    df['rocket_info'] = df['rocket'].apply(extraer_rocket_info)
-    df['launch_year'] = pd.to_datetime(df['date_utc']).dt.year
+    # Nombre del rocket de cada lanzamiento con un solo map (sin iterrows)
+    rocket_names = pd.Series({rocket_id: rocket.get('name', '') for rocket_id, rocket in rockets_data.items()},
+                             dtype=object)
+    df['rocket_name'] = df['rocket'].map(rocket_names).fillna('')
+    # date_utc siempre es ISO 8601 (YYYY-MM-DDT...): el año son los 4 primeros caracteres,
+    # sin parsear fechas completas; se reutiliza aguas abajo
+    df['launch_year'] = df['date_utc'].str.slice(0, 4).astype(int)
     df['success'] = df['success'].astype(bool)
     
-    # Verificar qué versiones de Falcon 9 existen
-    print("Verificando versiones de Falcon 9 disponibles...")
-    falcon9_versions = set()
-    for _, row in df.iterrows():
-        rocket_info = row['rocket_info']
-        if rocket_info and 'Falcon 9' in rocket_info.get('name', ''):
-            falcon9_versions.add(rocket_info.get('name', ''))
-    
-    print(f"Versiones de Falcon 9 encontradas: {list(falcon9_versions)}")
-    
     # Filtrar lanzamientos de Falcon 9 (cualquier versión)
-    f9_launches = []
+    f9_mask = df['rocket_name'].str.contains('Falcon 9', na=False, regex=False)
+    f9_launches = df.loc[f9_mask]
     
-    for _, row in df.iterrows():
-        rocket_info = row['rocket_info']
-        if rocket_info and 'Falcon 9' in rocket_info.get('name', ''):
-            f9_launches.append(row)
+    # Verificar qué versiones de Falcon 9 existen
+    print("Verificando versiones de Falcon 9 disponibles...")
+    falcon9_versions = f9_launches['rocket_name'].unique().tolist()
+    print(f"Versiones de Falcon 9 encontradas: {falcon9_versions}")
     
     if len(f9_launches) == 0:
         print("❌ No se encontraron lanzamientos de Falcon 9")
@@ -124,36 +60,33 @@ def calcular_payload_f9_v11(launches):
     
     print(f"✅ Lanzamientos de Falcon 9 encontrados: {len(f9_launches)}")
     
-    # Calcular masa total de payloads para Falcon 9
-    total_payload_mass = 0
-    valid_launches = 0
-    launch_details = []
-    
-    for launch in f9_launches:
-        launch_payloads = launch['payload_info']
-        launch_total_mass = 0
-        
-        for payload in launch_payloads:
-            mass = payload.get('mass_kg', 0)
-            if mass is not None and mass > 0:
-                launch_total_mass += mass
-        
-        if launch_total_mass > 0:
-            total_payload_mass += launch_total_mass
-            valid_launches += 1
-            launch_details.append({
-                'flight_number': launch['flight_number'],
-                'name': launch['name'],
-                'date': launch['date_utc'][:10],
-                'payload_mass': launch_total_mass,
-                'success': launch['success']
-            })
-    
-    if valid_launches == 0:
+    # Masa de payloads por lanzamiento: explode + merge contra la tabla de payloads
+    payloads_df = pd.DataFrame({
+        'payload_id': list(payloads_data.keys()),
+        'mass_kg': pd.to_numeric([payload.get('mass_kg', 0) for payload in payloads_data.values()],
+                                 errors='coerce')
+    })
+    merged = (f9_launches[['flight_number', 'name', 'date_utc', 'launch_year', 'success', 'payloads']]
+              .explode('payloads')
+              .rename(columns={'payloads': 'payload_id'})
+              .merge(payloads_df, on='payload_id', how='left'))
+    merged['mass_kg'] = merged['mass_kg'].where(merged['mass_kg'] > 0)
+    
+    # Calcular masa total de payloads por lanzamiento en un solo groupby
+    per_flight = (merged.groupby(['flight_number', 'name', 'date_utc', 'launch_year', 'success'],
+                                 as_index=False, sort=False, dropna=False)['mass_kg'].sum()
+                  .rename(columns={'mass_kg': 'payload_mass'}))
+    per_flight = per_flight[per_flight['payload_mass'] > 0]
+    
+    if len(per_flight) == 0:
         print("❌ No se encontraron lanzamientos válidos con masa de payload")
         return None, None, None
     
-    average_payload_mass = total_payload_mass / valid_launches
+    average_payload_mass = per_flight['payload_mass'].mean()
+    
+    launch_details = (per_flight.assign(date=per_flight['date_utc'].str[:10], year=per_flight['launch_year'])
+                      [['flight_number', 'name', 'date', 'year', 'payload_mass', 'success']]
+                      .reset_index(drop=True))
     
     return average_payload_mass, launch_details, f9_launches
 
@@ -176,40 +109,38 @@ def mostrar_resultados_f9_v11(avg_mass, launch_details, f9_launches):
     print(f"   Valid launches with payload data: {len(launch_details)}")
     
     if len(launch_details) > 0:
-        success_rate = sum(1 for launch in launch_details if launch['success']) / len(launch_details) * 100
+        success_rate = launch_details['success'].mean() * 100
         print(f"   Success rate: {success_rate:.1f}%")
         
-        # Estadísticas adicionales
-        payload_masses = [launch['payload_mass'] for launch in launch_details]
+        # Estadísticas adicionales (reducciones vectorizadas sobre la columna de masas)
+        payload_masses = launch_details['payload_mass']
+        stats = payload_masses.agg(['min', 'max', 'median'])
         print(f"\n📈 PAYLOAD MASS STATISTICS:")
-        print(f"   Minimum payload mass: {np.min(payload_masses):,.2f} kg")
-        print(f"   Maximum payload mass: {np.max(payload_masses):,.2f} kg")
-        print(f"   Median payload mass: {np.median(payload_masses):,.2f} kg")
-        print(f"   Standard deviation: {np.std(payload_masses):,.2f} kg")
+        print(f"   Minimum payload mass: {stats['min']:,.2f} kg")
+        print(f"   Maximum payload mass: {stats['max']:,.2f} kg")
+        print(f"   Median payload mass: {stats['median']:,.2f} kg")
+        print(f"   Standard deviation: {payload_masses.std(ddof=0):,.2f} kg")
         
         print(f"\n📋 FALCON 9 LAUNCHES DETAILS:")
         print("-" * 80)
         
         # Mostrar los primeros 10 lanzamientos de Falcon 9
-        for i, launch in enumerate(launch_details[:10], 1):
-            success_icon = "✅" if launch['success'] else "❌"
-            print(f"{i:2d}. Flight #{launch['flight_number']} - {launch['name']} {success_icon}")
-            print(f"    Date: {launch['date']}")
-            print(f"    Payload Mass: {launch['payload_mass']:,.2f} kg")
+        for i, launch in enumerate(launch_details.head(10).itertuples(index=False), 1):
+            success_icon = "✅" if launch.success else "❌"
+            print(f"{i:2d}. Flight #{launch.flight_number} - {launch.name} {success_icon}")
+            print(f"    Date: {launch.date}")
+            print(f"    Payload Mass: {launch.payload_mass:,.2f} kg")
             print("-" * 80)
         
         if len(launch_details) > 10:
             print(f"... and {len(launch_details) - 10} more Falcon 9 launches")
         
         # Agrupar por año
-        launch_df = pd.DataFrame(launch_details)
-        launch_df['year'] = pd.to_datetime(launch_df['date']).dt.year
-        yearly_stats = launch_df.groupby('year')['payload_mass'].agg(['mean', 'count']).reset_index()
-        yearly_stats.columns = ['Year', 'Average Mass (kg)', 'Launch Count']
+        yearly_stats = launch_details.groupby('year')['payload_mass'].agg(['mean', 'count'])
         
         print(f"\n📅 FALCON 9 PAYLOADS BY YEAR:")
-        for _, row in yearly_stats.iterrows():
-            print(f"   {int(row['Year'])}: {row['Average Mass (kg)']:,.2f} kg avg ({int(row['Launch Count'])} launches)")
+        for year, mean_mass, launch_count in yearly_stats.itertuples():
+            print(f"   {year}: {mean_mass:,.2f} kg avg ({launch_count} launches)")
 
 def grafica_f9_v11_payloads(launch_details):
     """
@@ -222,10 +153,9 @@ def grafica_f9_v11_payloads(launch_details):
     print("Creando gráfica de payloads para Falcon 9...")
     
     # Preparar datos
-    launch_df = pd.DataFrame(launch_details)
-    launch_df['year'] = pd.to_datetime(launch_df['date']).dt.year
+    launch_df = launch_details
     
-    plt.figure(figsize=(16, 10))
+    fig = plt.figure(figsize=(16, 10))
     
     # Gráfica 1: Masa de payload por lanzamiento
     plt.subplot(2, 1, 1)
@@ -252,7 +182,9 @@ def grafica_f9_v11_payloads(launch_details):
     plt.grid(axis='y', alpha=0.3)
     
     plt.tight_layout()
-    plt.show()
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
 
 def main():
     """
@@ -261,13 +193,13 @@ def main():
     print("🚀 SPACEX FALCON 9 AVERAGE PAYLOAD MASS CALCULATION")
     print("="*60)
     
-    # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    # 1. Obtener datos (lanzamientos, payloads y rockets en paralelo)
+    launches, payloads_data, rockets_data = obtener_datos_completos('payloads', 'rockets')
     if launches is None:
         return
     
     # 2. Calcular masa promedio de payloads para Falcon 9
-    avg_mass, launch_details, f9_launches = calcular_payload_f9_v11(launches)
+    avg_mass, launch_details, f9_launches = calcular_payload_f9_v11(launches, payloads_data, rockets_data)
     
     # 3. Mostrar resultados
     mostrar_resultados_f9_v11(avg_mass, launch_details, f9_launches)
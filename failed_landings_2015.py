@@ -3,130 +3,85 @@ SpaceX EDA - 2015 Launch Records
 List the failed landing_outcomes in drone ship, their booster versions, and launch site names for year 2015
 """
 
-import requests
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 import numpy as np
+from collections import Counter
+from operator import itemgetter
+from spacex_client import obtener_datos_completos, obtener_por_id
+from spacex_plot import importar_pyplot
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+# Nombres de mes indexados por (mes - 1) para traducir varios meses de una vez
+MONTH_NAMES = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                        'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
 
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_rockets():
-    """
-    Obtiene datos de rockets desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/rockets')
-        response.raise_for_status()
-        rockets = response.json()
-        return {rocket['id']: rocket for rocket in rockets}
-    except:
-        return {}
-
-def obtener_datos_launchpads():
-    """
-    Obtiene datos de launchpads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/launchpads')
-        response.raise_for_status()
-        launchpads = response.json()
-        return {launchpad['id']: launchpad for launchpad in launchpads}
-    except:
-        return {}
-
-def buscar_aterrizajes_fallidos_2015(launches):
+def buscar_aterrizajes_fallidos_2015(launches, rockets_data=None, launchpads_data=None):
     """
     Busca aterrizajes fallidos en drone ship para el año 2015
     """
     print("Buscando aterrizajes fallidos en drone ship para 2015...")
     
-    # Obtener datos de rockets y launchpads
-    print("Obteniendo datos de rockets y launchpads...")
-    rockets_data = obtener_datos_rockets()
-    launchpads_data = obtener_datos_launchpads()
-    
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
-    
-    # Filtrar lanzamientos de 2015
-    df['launch_year'] = pd.to_datetime(df['date_utc']).dt.year
-    df_2015 = df[df['launch_year'] == 2015].copy()
-    
-    print(f"✅ Lanzamientos de 2015: {len(df_2015)}")
-    
-    # Extraer información de rockets
-    def extraer_rocket_info(rocket_id):
-        """Extrae información del rocket"""
-        if rocket_id and rocket_id in rockets_data:
-            return rockets_data[rocket_id]
-        return None
-    
-    # Extraer información de launchpads
-    def extraer_launchpad_info(launchpad_id):
-        """Extrae información del launchpad"""
-        if launchpad_id and launchpad_id in launchpads_data:
-            return launchpads_data[launchpad_id]
-        return None
-    
-    # Crear nuevas columnas
-    df_2015['rocket_info'] = df_2015['rocket'].apply(extraer_rocket_info)
-    df_2015['launchpad_info'] = df_2015['launchpad'].apply(extraer_launchpad_info)
-    
-    # Buscar aterrizajes fallidos en drone ship
-    failed_drone_ship_landings = []
-    
-    for _, row in df_2015.iterrows():
-        cores = row['cores']
-        if cores and len(cores) > 0:
-            for core in cores:
-                # Verificar si el aterrizaje fue fallido y en drone ship (ASDS)
-                landing_success = core.get('landing_success', False)
-                landing_type = core.get('landing_type', '')
-                
-                if not landing_success and landing_type == 'ASDS':
-                    failed_drone_ship_landings.append({
-                        'flight_number': row['flight_number'],
-                        'name': row['name'],
-                        'date_utc': row['date_utc'],
-                        'date_local': row['date_local'],
-                        'rocket_name': row['rocket_info'].get('name', 'Unknown') if row['rocket_info'] else 'Unknown',
-                        'rocket_type': row['rocket_info'].get('type', 'Unknown') if row['rocket_info'] else 'Unknown',
-                        'launch_site_name': row['launchpad_info'].get('name', 'Unknown') if row['launchpad_info'] else 'Unknown',
-                        'launch_site_full_name': row['launchpad_info'].get('full_name', 'Unknown') if row['launchpad_info'] else 'Unknown',
-                        'launch_site_locality': row['launchpad_info'].get('locality', 'Unknown') if row['launchpad_info'] else 'Unknown',
-                        'launch_site_region': row['launchpad_info'].get('region', 'Unknown') if row['launchpad_info'] else 'Unknown',
-                        'landing_type': landing_type,
-                        'landing_success': landing_success,
-                        'landpad': core.get('landpad', 'Unknown'),
-                        'reused': core.get('reused', False),
-                        'core_id': core.get('core', 'Unknown')
-                    })
+    # Obtener datos de rockets y launchpads si no se recibieron ya
+    if rockets_data is None or launchpads_data is None:
+        print("Obteniendo datos de rockets y launchpads...")
+        rockets_data = obtener_por_id('rockets') if rockets_data is None else rockets_data
+        launchpads_data = obtener_por_id('launchpads') if launchpads_data is None else launchpads_data
+    
+    # Filtrar lanzamientos de 2015 (el año es el prefijo de la fecha ISO; con tan pocas
+    # filas el coste de construir un DataFrame supera al del propio filtro)
+    launches_2015 = [launch for launch in launches if launch['date_utc'].startswith('2015')]
+    
+    print(f"✅ Lanzamientos de 2015: {len(launches_2015)}")
+    
+    # Campos de salida precalculados por id: cada registro hace una sola búsqueda por
+    # rocket y otra por launchpad, con 'Unknown' ya resuelto
+    rocket_fields = {
+        rid: {'rocket_name': r.get('name', 'Unknown'), 'rocket_type': r.get('type', 'Unknown')}
+        for rid, r in rockets_data.items()
+    }
+    site_fields = {
+        pid: {
+            'launch_site_name': p.get('name', 'Unknown'),
+            'launch_site_full_name': p.get('full_name', 'Unknown'),
+            'launch_site_locality': p.get('locality', 'Unknown'),
+            'launch_site_region': p.get('region', 'Unknown')
+        }
+        for pid, p in launchpads_data.items()
+    }
+    unknown_rocket = dict.fromkeys(['rocket_name', 'rocket_type'], 'Unknown')
+    unknown_site = dict.fromkeys(['launch_site_name', 'launch_site_full_name',
+                                  'launch_site_locality', 'launch_site_region'], 'Unknown')
+    
+    def construir_registro(launch, core):
+        """Registro de un core con la información de su rocket y launchpad"""
+        return {
+            'flight_number': launch['flight_number'],
+            'name': launch['name'],
+            'date_utc': launch['date_utc'],
+            'date_local': launch['date_local'],
+            # Año y mes tomados del texto ISO una sola vez para el resumen y las gráficas
+            'year': int(launch['date_utc'][0:4]),
+            'month': int(launch['date_utc'][5:7]),
+            **rocket_fields.get(launch.get('rocket'), unknown_rocket),
+            **site_fields.get(launch.get('launchpad'), unknown_site),
+            'landing_type': core.get('landing_type', ''),
+            'landing_success': core.get('landing_success', False),
+            'landpad': core.get('landpad', 'Unknown'),
+            'reused': core.get('reused', False),
+            'core_id': core.get('core', 'Unknown')
+        }
+    
+    # Aterrizajes fallidos en drone ship (ASDS)
+    failed_drone_ship_landings = [
+        construir_registro(launch, core)
+        for launch in launches_2015
+        for core in (launch.get('cores') or [])
+        if core.get('landing_type') == 'ASDS' and not core.get('landing_success', False)
+    ]
     
     # Ordenar por fecha
-    failed_drone_ship_landings.sort(key=lambda x: x['date_utc'])
+    failed_drone_ship_landings.sort(key=itemgetter('date_utc'))
     
     print(f"✅ Aterrizajes fallidos en drone ship para 2015: {len(failed_drone_ship_landings)}")
     
@@ -172,33 +127,26 @@ def mostrar_resultados_2015(landings):
         print("-" * 80)
     
     # Estadísticas adicionales
-    rocket_names = [landing['rocket_name'] for landing in landings]
-    rocket_counts = pd.Series(rocket_names).value_counts()
+    rocket_counts = Counter(landing['rocket_name'] for landing in landings).most_common()
     
     print(f"\n📈 BOOSTER VERSION DISTRIBUTION:")
-    for rocket, count in rocket_counts.items():
+    for rocket, count in rocket_counts:
         print(f"   {rocket}: {count} failed landings")
     
-    launch_sites = [landing['launch_site_name'] for landing in landings]
-    site_counts = pd.Series(launch_sites).value_counts()
+    site_counts = Counter(landing['launch_site_name'] for landing in landings).most_common()
     
     print(f"\n🏗️ LAUNCH SITE DISTRIBUTION:")
-    for site, count in site_counts.items():
+    for site, count in site_counts:
         print(f"   {site}: {count} failed landings")
     
     # Análisis por mes
-    landing_df = pd.DataFrame(landings)
-    landing_df['month'] = pd.to_datetime(landing_df['date_utc']).dt.month
-    monthly_landings = landing_df.groupby('month').size().reset_index()
-    monthly_landings.columns = ['Month', 'Failed Landing Count']
-    
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    months = np.array([landing['month'] for landing in landings])
+    unique_months, month_counts = np.unique(months, return_counts=True)
+    month_labels = MONTH_NAMES[unique_months - 1]
     
     print(f"\n📅 FAILED LANDINGS BY MONTH:")
-    for _, row in monthly_landings.iterrows():
-        month_name = month_names[int(row['Month']) - 1]
-        print(f"   {month_name} 2015: {int(row['Failed Landing Count'])} failed landings")
+    for month_name, count in zip(month_labels, month_counts):
+        print(f"   {month_name} 2015: {count} failed landings")
 
 def grafica_aterrizajes_fallidos_2015(landings):
     """
@@ -209,18 +157,20 @@ def grafica_aterrizajes_fallidos_2015(landings):
         return
     
     print("Creando gráfica de aterrizajes fallidos en 2015...")
+    plt = importar_pyplot()
     
-    # Preparar datos
-    landing_df = pd.DataFrame(landings)
-    landing_df['month'] = pd.to_datetime(landing_df['date_utc']).dt.month
+    # Preparar datos: conteos directos desde los registros (sin construir un DataFrame
+    # a partir de la lista de diccionarios solo para contar tres campos)
+    rocket_names, rocket_totals = zip(*Counter(landing['rocket_name'] for landing in landings).most_common())
+    site_names, site_totals = zip(*Counter(landing['launch_site_name'] for landing in landings).most_common())
+    unique_months, month_counts = np.unique([landing['month'] for landing in landings], return_counts=True)
     
-    plt.figure(figsize=(16, 10))
+    fig = plt.figure(figsize=(16, 10))
     
     # Gráfica 1: Distribución por booster
     plt.subplot(2, 2, 1)
-    rocket_counts = landing_df['rocket_name'].value_counts()
-    colors = plt.cm.Set3(np.linspace(0, 1, len(rocket_counts)))
-    plt.bar(rocket_counts.index, rocket_counts.values, color=colors, alpha=0.7)
+    colors = plt.cm.Set3(np.linspace(0, 1, len(rocket_names)))
+    plt.bar(rocket_names, rocket_totals, color=colors, alpha=0.7)
     plt.xlabel('Booster Version', fontsize=12, fontweight='bold')
     plt.ylabel('Number of Failed Landings', fontsize=12, fontweight='bold')
     plt.title('Failed Drone Ship Landings by Booster Version (2015)', fontsize=14, fontweight='bold')
@@ -229,9 +179,8 @@ def grafica_aterrizajes_fallidos_2015(landings):
     
     # Gráfica 2: Distribución por sitio de lanzamiento
     plt.subplot(2, 2, 2)
-    site_counts = landing_df['launch_site_name'].value_counts()
-    colors = plt.cm.viridis(np.linspace(0, 1, len(site_counts)))
-    plt.bar(site_counts.index, site_counts.values, color=colors, alpha=0.7)
+    colors = plt.cm.viridis(np.linspace(0, 1, len(site_names)))
+    plt.bar(site_names, site_totals, color=colors, alpha=0.7)
     plt.xlabel('Launch Site', fontsize=12, fontweight='bold')
     plt.ylabel('Number of Failed Landings', fontsize=12, fontweight='bold')
     plt.title('Failed Drone Ship Landings by Launch Site (2015)', fontsize=14, fontweight='bold')
@@ -240,12 +189,9 @@ def grafica_aterrizajes_fallidos_2015(landings):
     
     # Gráfica 3: Distribución por mes
     plt.subplot(2, 2, 3)
-    monthly_landings = landing_df.groupby('month').size()
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    month_labels = [month_names[int(month) - 1] for month in monthly_landings.index]
+    month_labels = MONTH_NAMES[unique_months - 1]
     
-    plt.bar(month_labels, monthly_landings.values, color='red', alpha=0.7)
+    plt.bar(month_labels, month_counts, color='red', alpha=0.7)
     plt.xlabel('Month', fontsize=12, fontweight='bold')
     plt.ylabel('Number of Failed Landings', fontsize=12, fontweight='bold')
     plt.title('Failed Drone Ship Landings by Month (2015)', fontsize=14, fontweight='bold')
@@ -265,7 +211,9 @@ def grafica_aterrizajes_fallidos_2015(landings):
     plt.title('2015 Launch Outcomes\n(Drone Ship Landing Failures)', fontsize=14, fontweight='bold')
     
     plt.tight_layout()
-    plt.show()
+    if plt.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
 
 def main():
     """
@@ -275,18 +223,19 @@ def main():
     print("="*60)
     
     # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    launches, rockets_data, launchpads_data = obtener_datos_completos('rockets', 'launchpads')
     if launches is None:
         return
     
     # 2. Buscar aterrizajes fallidos en drone ship para 2015
-    landings = buscar_aterrizajes_fallidos_2015(launches)
+    landings = buscar_aterrizajes_fallidos_2015(launches, rockets_data, launchpads_data)
     
     # 3. Mostrar resultados
     mostrar_resultados_2015(landings)
     
-    # 4. Crear visualización
-    grafica_aterrizajes_fallidos_2015(landings)
+    # 4. Crear visualización (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        grafica_aterrizajes_fallidos_2015(landings)
     
     print("\n✅ Análisis completado exitosamente!")
 
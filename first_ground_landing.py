@@ -3,78 +3,65 @@ SpaceX EDA - First Successful Ground Landing Date
 Find the dates of the first successful landing outcome on ground pad
 """
 
-import requests
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from collections import Counter
+from spacex_client import obtener_datos_spacex
+from spacex_plot import importar_pyplot
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
 def buscar_primer_aterrizaje_exitoso(launches):
     """
     Busca el primer aterrizaje exitoso en tierra
     """
     print("Buscando el primer aterrizaje exitoso en tierra...")
     
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
+    # Convertir a DataFrame (solo las columnas usadas: el resto de campos de cada
+    # lanzamiento se copiaría en cada explode/filtro sin leerse nunca)
+    df = pd.DataFrame(launches, columns=['flight_number', 'name', 'date_utc', 'date_local', 'cores'])
     
     # Filtrar lanzamientos con información de cores
-    df_with_cores = df[df['cores'].notna()].copy()
+    df_with_cores = df[df['cores'].notna()]
     
     print(f"✅ Lanzamientos con información de cores: {len(df_with_cores)}")
     
-    # Buscar aterrizajes exitosos en tierra
-    successful_ground_landings = []
-    
-    for _, row in df_with_cores.iterrows():
-        cores = row['cores']
-        if cores and len(cores) > 0:
-            for core in cores:
-                # Verificar si el aterrizaje fue exitoso y en tierra
-                landing_success = core.get('landing_success', False)
-                landing_type = core.get('landing_type', '')
-                
-                # Tipos de aterrizaje en tierra
-                ground_landing_types = ['RTLS', 'ASDS', 'Ocean']
-                
-                if landing_success and landing_type in ground_landing_types:
-                    successful_ground_landings.append({
-                        'flight_number': row['flight_number'],
-                        'name': row['name'],
-                        'date_utc': row['date_utc'],
-                        'date_local': row['date_local'],
-                        'landing_type': landing_type,
-                        'landing_success': landing_success,
-                        'landpad': core.get('landpad', 'Unknown'),
-                        'reused': core.get('reused', False)
-                    })
-    
-    # Ordenar por fecha
-    successful_ground_landings.sort(key=lambda x: x['date_utc'])
+    # Una fila por core con sus campos en columnas
+    df_cores = df_with_cores.explode('cores', ignore_index=True)
+    df_cores = df_cores[df_cores['cores'].notna()].reset_index(drop=True)
+    # Solo se extraen los campos usados, con un acceso directo por campo (json_normalize
+    # aplanaría recursivamente todos los campos de cada core); dtype=object conserva None
+    core_dicts = df_cores['cores'].tolist()
+    cores = pd.DataFrame({campo: [core.get(campo) for core in core_dicts]
+                          for campo in ['landing_type', 'landing_success', 'landpad', 'reused']},
+                         dtype=object)
+    
+    # Aterrizajes exitosos en tierra
+    ground_landing_types = ['RTLS', 'ASDS', 'Ocean']
+    mask = (cores['landing_success'].eq(True) & cores['landing_type'].isin(ground_landing_types)).to_numpy()
+    df_cores = df_cores[mask]
+    cores = cores[mask]
+    
+    successful_ground_landings = pd.DataFrame({
+        'flight_number': df_cores['flight_number'].to_numpy(),
+        'name': df_cores['name'].to_numpy(),
+        'date_utc': df_cores['date_utc'].to_numpy(),
+        'date_local': df_cores['date_local'].to_numpy(),
+        # Año y mes tomados del texto ISO una sola vez para el resumen y las gráficas
+        'year': df_cores['date_utc'].str.slice(0, 4).astype(int).to_numpy(),
+        'month': df_cores['date_utc'].str.slice(5, 7).astype(int).to_numpy(),
+        'landing_type': cores['landing_type'].to_numpy(),
+        'landing_success': cores['landing_success'].to_numpy(),
+        'landpad': cores['landpad'].to_numpy(),
+        'reused': cores['reused'].to_numpy()
+    }, dtype=object)
+    
+    # Ordenar por fecha (la API ya devuelve los lanzamientos en orden cronológico, así que
+    # normalmente basta con comprobarlo)
+    if not successful_ground_landings['date_utc'].is_monotonic_increasing:
+        successful_ground_landings = successful_ground_landings.sort_values('date_utc', kind='stable')
+    successful_ground_landings = successful_ground_landings.to_dict('records')
     
     print(f"✅ Aterrizajes exitosos en tierra encontrados: {len(successful_ground_landings)}")
     
@@ -118,24 +105,19 @@ def mostrar_resultados_aterrizaje(landings):
         print("-" * 80)
     
     # Estadísticas adicionales
-    landing_types = {}
-    for landing in landings:
-        landing_type = landing['landing_type']
-        landing_types[landing_type] = landing_types.get(landing_type, 0) + 1
+    landing_types = Counter(landing['landing_type'] for landing in landings)
     
     print(f"\n📈 LANDING TYPE STATISTICS:")
     for landing_type, count in landing_types.items():
         print(f"   {landing_type}: {count} successful landings")
     
     # Agrupar por año
-    landing_df = pd.DataFrame(landings)
-    landing_df['year'] = pd.to_datetime(landing_df['date_utc']).dt.year
-    yearly_landings = landing_df.groupby('year').size().reset_index()
-    yearly_landings.columns = ['Year', 'Landing Count']
+    years = np.array([landing['year'] for landing in landings])
+    unique_years, year_counts = np.unique(years, return_counts=True)
     
     print(f"\n📅 SUCCESSFUL GROUND LANDINGS BY YEAR:")
-    for _, row in yearly_landings.iterrows():
-        print(f"   {int(row['Year'])}: {int(row['Landing Count'])} landings")
+    for year, count in zip(unique_years, year_counts):
+        print(f"   {year}: {count} landings")
 
 def grafica_aterrizajes_exitosos(landings):
     """
@@ -146,18 +128,18 @@ def grafica_aterrizajes_exitosos(landings):
         return
     
     print("Creando gráfica de aterrizajes exitosos...")
+    plt = importar_pyplot()
     
-    # Preparar datos
-    landing_df = pd.DataFrame(landings)
-    landing_df['year'] = pd.to_datetime(landing_df['date_utc']).dt.year
-    landing_df['month'] = pd.to_datetime(landing_df['date_utc']).dt.month
+    # Preparar datos: conteos directos desde los registros (sin construir un DataFrame
+    # a partir de la lista de diccionarios solo para contar dos campos)
+    unique_years, year_counts = np.unique([landing['year'] for landing in landings], return_counts=True)
+    type_names, type_totals = zip(*Counter(landing['landing_type'] for landing in landings).most_common())
     
     plt.figure(figsize=(16, 10))
     
     # Gráfica 1: Aterrizajes por año
     plt.subplot(2, 1, 1)
-    yearly_landings = landing_df.groupby('year').size()
-    plt.bar(yearly_landings.index, yearly_landings.values, color='green', alpha=0.7)
+    plt.bar(unique_years, year_counts, color='green', alpha=0.7)
     plt.xlabel('Year', fontsize=12, fontweight='bold')
     plt.ylabel('Number of Successful Ground Landings', fontsize=12, fontweight='bold')
     plt.title('SpaceX Successful Ground Landings by Year', fontsize=14, fontweight='bold')
@@ -165,10 +147,9 @@ def grafica_aterrizajes_exitosos(landings):
     
     # Gráfica 2: Tipos de aterrizaje
     plt.subplot(2, 1, 2)
-    landing_types = landing_df['landing_type'].value_counts()
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
-    plt.pie(landing_types.values, labels=landing_types.index, autopct='%1.1f%%', 
-            colors=colors[:len(landing_types)], startangle=90)
+    plt.pie(type_totals, labels=type_names, autopct='%1.1f%%', 
+            colors=colors[:len(type_names)], startangle=90)
     plt.title('Distribution of Landing Types', fontsize=14, fontweight='bold')
     
     plt.tight_layout()
@@ -192,8 +173,9 @@ def main():
     # 3. Mostrar resultados
     mostrar_resultados_aterrizaje(landings)
     
-    # 4. Crear visualización
-    grafica_aterrizajes_exitosos(landings)
+    # 4. Crear visualización (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        grafica_aterrizajes_exitosos(landings)
     
     print("\n✅ Análisis completado exitosamente!")
 
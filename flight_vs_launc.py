@@ -5,64 +5,56 @@ Author: Camilo Medina
 Description: Generate scatter plot analysis for SpaceX launch data
 """
 
+import os
+import sys
 import pandas as pd
+import matplotlib
+# Headless runs (HEADLESS set or output not a terminal) only need the PNGs: skip GUI backend setup
+if os.environ.get('HEADLESS') or not sys.stdout.isatty():
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+# PNG resolution: 120 dpi for quick runs, 300 dpi with --publish
+SAVE_DPI = 300 if '--publish' in sys.argv else 120
+
 def create_spacex_sample_data():
     """
     Create sample SpaceX launch data based on the lab results
     """
-    # Launch sites from the lab data
+    # Launch sites from the lab data, with launch count and per-site parameters
     launch_sites = ['CCAFS SLC 40', 'KSC LC 39A', 'VAFB SLC 4E']
-    
-    # Generate realistic flight numbers and launch data
-    np.random.seed(42)  # For reproducible results
-    
-    data = []
-    flight_number = 1
-    
-    # CCAFS SLC 40 - Most active site (55 launches, 61%)
-    for i in range(55):
-        data.append({
-            'FlightNumber': flight_number,
-            'LaunchSite': 'CCAFS SLC 40',
-            'Date': datetime(2010, 1, 1) + timedelta(days=np.random.randint(0, 3650)),
-            'PayloadMass': np.random.normal(5000, 1500),
-            'Orbit': np.random.choice(['LEO', 'GTO', 'ISS'], p=[0.4, 0.3, 0.3]),
-            'Class': np.random.choice([0, 1], p=[0.33, 0.67])  # 67% success rate
-        })
-        flight_number += 1
-    
-    # KSC LC 39A - Second most active (22 launches, 24%)
-    for i in range(22):
-        data.append({
-            'FlightNumber': flight_number,
-            'LaunchSite': 'KSC LC 39A',
-            'Date': datetime(2010, 1, 1) + timedelta(days=np.random.randint(0, 3650)),
-            'PayloadMass': np.random.normal(6000, 2000),
-            'Orbit': np.random.choice(['LEO', 'GTO', 'ISS'], p=[0.3, 0.4, 0.3]),
-            'Class': np.random.choice([0, 1], p=[0.25, 0.75])  # 75% success rate
-        })
-        flight_number += 1
-    
-    # VAFB SLC 4E - Least active (13 launches, 14%)
-    for i in range(13):
-        data.append({
-            'FlightNumber': flight_number,
-            'LaunchSite': 'VAFB SLC 4E',
-            'Date': datetime(2010, 1, 1) + timedelta(days=np.random.randint(0, 3650)),
-            'PayloadMass': np.random.normal(4000, 1000),
-            'Orbit': np.random.choice(['LEO', 'GTO', 'ISS'], p=[0.5, 0.2, 0.3]),
-            'Class': np.random.choice([0, 1], p=[0.4, 0.6])  # 60% success rate
-        })
-        flight_number += 1
-    
-    return pd.DataFrame(data)
+    site_launches = [55, 22, 13]           # Most active -> least active (61%, 24%, 14%)
+    payload_means = np.array([5000, 6000, 4000])
+    payload_stds = np.array([1500, 2000, 1000])
+    orbit_probs = np.array([[0.4, 0.3, 0.3], [0.3, 0.4, 0.3], [0.5, 0.2, 0.3]])
+    success_rates = np.array([0.67, 0.75, 0.60])
+    orbits = np.array(['LEO', 'GTO', 'ISS'])
+    
+    # Generate realistic flight numbers and launch data: per-site parameters are
+    # broadcast to one row per launch so each column is a single Generator call
+    rng = np.random.default_rng(42)  # For reproducible results
+    site_idx = np.repeat(np.arange(len(launch_sites)), site_launches)
+    n_launches = len(site_idx)
+    
+    payload = rng.normal(payload_means[site_idx], payload_stds[site_idx])
+    # Orbit by inverse CDF: count how many cumulative per-site thresholds each draw exceeds
+    orbit_cdf = np.cumsum(orbit_probs, axis=1)[site_idx]
+    orbit_idx = (rng.random((n_launches, 1)) >= orbit_cdf[:, :-1]).sum(axis=1)
+    success = (rng.random(n_launches) < success_rates[site_idx]).astype(int)
+    days = rng.integers(0, 3650, n_launches)
+    
+    return pd.DataFrame({
+        'FlightNumber': np.arange(1, n_launches + 1),
+        'LaunchSite': np.array(launch_sites)[site_idx],
+        'Date': np.datetime64('2010-01-01') + days.astype('timedelta64[D]'),
+        'PayloadMass': payload,
+        'Orbit': orbits[orbit_idx],
+        'Class': success
+    })
 
 def generate_flight_number_vs_launch_site_plot():
     """
@@ -145,11 +137,13 @@ def generate_flight_number_vs_launch_site_plot():
     
     # Save the plot
     output_filename = 'flight_number_vs_launch_site_scatter.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight')
+    fig.savefig(output_filename, dpi=SAVE_DPI, bbox_inches='tight')
     print(f"   - Plot saved as: {output_filename}")
     
-    # Show the plot
-    plt.show()
+    # Show the plot (interactive backends only) and free the figure
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
     
     # Generate summary statistics
     print("\n4. Summary Statistics:")
@@ -210,9 +204,11 @@ def create_additional_eda_plots(df):
     axes[1, 1].set_title('Orbit Type Distribution', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('spacex_comprehensive_eda.png', dpi=300, bbox_inches='tight')
+    fig.savefig('spacex_comprehensive_eda.png', dpi=SAVE_DPI, bbox_inches='tight')
     print("   - Comprehensive EDA plot saved as: spacex_comprehensive_eda.png")
-    plt.show()
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
     print("🚀 SpaceX EDA Analysis - Flight Number vs. Launch Site")
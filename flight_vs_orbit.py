@@ -3,47 +3,16 @@ SpaceX EDA - Flight Number vs Orbit Type
 Individual chart for Flight Number vs Orbit Type analysis
 """
 
-import requests
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from spacex_client import obtener_datos_spacex, precargar, obtener_por_id
+from spacex_plot import importar_pyplot
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_payloads():
-    """
-    Obtiene datos de payloads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/payloads')
-        response.raise_for_status()
-        payloads = response.json()
-        return {payload['id']: payload for payload in payloads}
-    except:
-        return {}
+# Campos de cada lanzamiento que usa el análisis; el resto de la respuesta no se carga
+LAUNCH_COLUMNS = ['flight_number', 'date_utc', 'success', 'payloads']
 
 def procesar_datos(launches):
     """
@@ -53,24 +22,27 @@ def procesar_datos(launches):
     
     # Obtener datos de payloads
     print("Obteniendo datos de payloads...")
-    payloads_data = obtener_datos_payloads()
-    
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
-    
-    # Extraer información de payloads
-    def extraer_orbit(payload_ids):
-        """Extrae el tipo de órbita del primer payload"""
-        if payload_ids and len(payload_ids) > 0:
-            payload_id = payload_ids[0]
-            if payload_id in payloads_data:
-                return payloads_data[payload_id].get('orbit', 'Unknown')
-        return 'Unknown'
+    payloads_data = obtener_por_id('payloads')
+    
+    # Convertir a DataFrame (solo LAUNCH_COLUMNS)
+    df = pd.DataFrame(launches, columns=LAUNCH_COLUMNS)
+    df['flight_number'] = df['flight_number'].astype(np.int16)
+    
+    # Órbita del primer payload de cada lanzamiento con un join vectorizado en lugar de
+    # un apply por fila; los lanzamientos sin payload conocido quedan como 'Unknown'
+    payloads_df = pd.DataFrame({
+        'first_payload': list(payloads_data.keys()),
+        'orbit_type': [payload.get('orbit', 'Unknown') for payload in payloads_data.values()]
+    }, dtype=object)
+    df['first_payload'] = df['payloads'].str[0]
+    df = df.merge(payloads_df, on='first_payload', how='left', indicator=True)
+    df['orbit_type'] = df['orbit_type'].where(df.pop('_merge').eq('both'), 'Unknown')
     
     # Crear nuevas columnas
-    df['orbit_type'] = df['payloads'].apply(extraer_orbit)
-    df['launch_year'] = pd.to_datetime(df['date_utc']).dt.year
-    df['success'] = df['success'].astype(bool)
+    df['launch_year'] = pd.to_datetime(df['date_utc'], format='ISO8601', utc=True, cache=True).dt.year
+    # Los lanzamientos sin resultado (None/NaN) cuentan como no exitosos
+    df['success'] = df['success'].fillna(False).to_numpy(dtype=np.bool_)
+    assert df['success'].dtype == np.bool_
     
     # Filtrar datos válidos
     df_clean = df[df['orbit_type'] != 'Unknown'].copy()
@@ -85,21 +57,20 @@ def grafica_flight_vs_orbit(df):
     Crea gráfica de dispersión: Flight Number vs Orbit Type
     """
     print("Creando gráfica: Flight Number vs Orbit Type...")
+    plt = importar_pyplot()
+    from matplotlib.patches import Patch
     
     plt.figure(figsize=(14, 8))
     
-    # Crear gráfica de dispersión con colores por tipo de órbita
-    orbit_types = df['orbit_type'].unique()
+    # Una sola llamada a scatter: cada órbita se codifica como entero (orden de aparición)
+    orbit_codes, orbit_types = pd.factorize(df['orbit_type'], use_na_sentinel=False)
     colors = plt.cm.Set3(np.linspace(0, 1, len(orbit_types)))
     
-    for i, orbit in enumerate(orbit_types):
-        mask = df['orbit_type'] == orbit
-        plt.scatter(df[mask]['flight_number'], 
-                   [i] * mask.sum(),  # Posición Y basada en el índice del tipo de órbita
-                   c=[colors[i]], 
-                   label=orbit, 
-                   alpha=0.7, 
-                   s=60)
+    plt.scatter(df['flight_number'].to_numpy(), 
+               orbit_codes,  # Posición Y basada en el índice del tipo de órbita
+               c=colors[orbit_codes], 
+               alpha=0.7, 
+               s=60)
     
     plt.xlabel('Flight Number', fontsize=12, fontweight='bold')
     plt.ylabel('Orbit Type', fontsize=12, fontweight='bold')
@@ -110,13 +81,17 @@ def grafica_flight_vs_orbit(df):
     plt.yticks(range(len(orbit_types)), orbit_types)
     plt.xticks(rotation=45)
     plt.grid(True, alpha=0.3)
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.legend(handles=[Patch(color=colors[i], alpha=0.7, label=str(orbit)) for i, orbit in enumerate(orbit_types)],
+               bbox_to_anchor=(1.05, 1), loc='upper left')
     
     # Ajustar layout
     plt.tight_layout()
     plt.show()
-    
-    # Estadísticas adicionales
+
+def mostrar_estadisticas_orbitas(df):
+    """
+    Muestra estadísticas de número de vuelo por tipo de órbita
+    """
     print("\n📈 Estadísticas por tipo de órbita:")
     stats = df.groupby('orbit_type')['flight_number'].agg(['count', 'min', 'max', 'mean']).round(2)
     print(stats)
@@ -128,7 +103,8 @@ def main():
     print("🚀 FLIGHT NUMBER VS ORBIT TYPE ANALYSIS")
     print("="*50)
     
-    # 1. Obtener datos
+    # 1. Obtener datos (lanzamientos y payloads se descargan en paralelo)
+    precargar('launches', 'payloads')
     launches = obtener_datos_spacex()
     if launches is None:
         return
@@ -139,8 +115,12 @@ def main():
         print("❌ No se pudieron procesar los datos")
         return
     
-    # 3. Crear visualización
-    grafica_flight_vs_orbit(df)
+    # 3. Crear visualización (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        grafica_flight_vs_orbit(df)
+    
+    # 4. Estadísticas adicionales
+    mostrar_estadisticas_orbitas(df)
     
     print("\n✅ Análisis completado exitosamente!")
 
@@ -3,35 +3,17 @@ SpaceX EDA - Rank Landing Outcomes Between 2010-06-04 and 2017-03-20
 Rank the count of landing outcomes between the specified date range in descending order
 """
 
-import requests
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from collections import Counter
+from spacex_client import obtener_datos_spacex
+from spacex_plot import importar_pyplot
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
+# Campos de cada lanzamiento que usa el análisis; el resto de la respuesta no se carga
+LAUNCH_COLUMNS = ['flight_number', 'name', 'date_utc', 'cores']
 
 def clasificar_resultados_aterrizaje(launches):
     """
@@ -39,60 +21,51 @@ def clasificar_resultados_aterrizaje(launches):
     """
     print("Clasificando resultados de aterrizaje entre 2010-06-04 y 2017-03-20...")
     
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
+    # Convertir a DataFrame (solo LAUNCH_COLUMNS)
+    df = pd.DataFrame(launches, columns=LAUNCH_COLUMNS)
+    df['flight_number'] = df['flight_number'].astype(np.int16)
     
     # Filtrar por rango de fechas
-    start_date = '2010-06-04'
-    end_date = '2017-03-20'
+    start_date = pd.Timestamp('2010-06-04', tz='UTC')
+    end_date = pd.Timestamp('2017-03-20', tz='UTC')
     
-    df['date_utc'] = pd.to_datetime(df['date_utc'])
-    df_filtered = df[(df['date_utc'] >= start_date) & (df['date_utc'] <= end_date)].copy()
+    # Formato explícito: sin inferencia por elemento; la comparación es entre int64
+    df['date_utc'] = pd.to_datetime(df['date_utc'], format='ISO8601', utc=True, cache=True)
+    df_filtered = df[df['date_utc'].between(start_date, end_date)].copy()
     
     print(f"✅ Lanzamientos en el rango de fechas: {len(df_filtered)}")
     
-    # Analizar resultados de aterrizaje
-    landing_outcomes = []
-    
-    for _, row in df_filtered.iterrows():
-        cores = row['cores']
-        if cores and len(cores) > 0:
-            for core in cores:
-                landing_success = core.get('landing_success', False)
-                landing_type = core.get('landing_type', '')
-                
-                # Determinar el resultado del aterrizaje
-                if landing_success:
-                    if landing_type == 'RTLS':
-                        outcome = 'Success (ground pad)'
-                    elif landing_type == 'ASDS':
-                        outcome = 'Success (drone ship)'
-                    elif landing_type == 'Ocean':
-                        outcome = 'Success (ocean)'
-                    else:
-                        outcome = 'Success (other)'
-                else:
-                    if landing_type == 'RTLS':
-                        outcome = 'Failure (ground pad)'
-                    elif landing_type == 'ASDS':
-                        outcome = 'Failure (drone ship)'
-                    elif landing_type == 'Ocean':
-                        outcome = 'Failure (ocean)'
-                    else:
-                        outcome = 'Failure (other)'
-                
-                landing_outcomes.append({
-                    'flight_number': row['flight_number'],
-                    'name': row['name'],
-                    'date_utc': row['date_utc'],
-                    'outcome': outcome,
-                    'landing_success': landing_success,
-                    'landing_type': landing_type,
-                    'core_id': core.get('core', 'Unknown')
-                })
-    
-    # Contar resultados
-    outcome_counts = pd.Series([outcome['outcome'] for outcome in landing_outcomes]).value_counts()
+    # Una fila por core; los lanzamientos sin cores se descartan
+    df_cores = df_filtered[['flight_number', 'name', 'date_utc', 'cores']].explode('cores', ignore_index=True)
+    df_cores = df_cores[df_cores['cores'].notna()].reset_index(drop=True)
+    # Solo los campos usados, con un acceso directo por campo; dtype=object conserva None
+    core_dicts = df_cores.pop('cores').tolist()
+    df_cores = df_cores.join(pd.DataFrame({
+        'landing_success': [core.get('landing_success', False) for core in core_dicts],
+        'landing_type': [core.get('landing_type', '') for core in core_dicts],
+        'core_id': [core.get('core', 'Unknown') for core in core_dicts]
+    }, dtype=object))
+    
+    # Determinar el resultado del aterrizaje sin ramas por fila: código del tipo
+    # (RTLS/ASDS/Ocean, cualquier otro -> 'other') desplazado según éxito o fallo
+    sufijos = ['ground pad', 'drone ship', 'ocean', 'other']
+    outcome_names = [f"{resultado} ({sufijo})" for resultado in ('Success', 'Failure') for sufijo in sufijos]
+    type_codes = pd.Categorical(df_cores['landing_type'], categories=['RTLS', 'ASDS', 'Ocean']).codes
+    type_codes = np.where(type_codes < 0, len(sufijos) - 1, type_codes)
+    failure_offset = np.where(df_cores['landing_success'].eq(True).to_numpy(), 0, len(sufijos))
+    outcome_codes = type_codes + failure_offset
+    df_cores['outcome'] = pd.Categorical.from_codes(outcome_codes, categories=outcome_names)
+    
+    # Se devuelve el DataFrame plano (una fila por core) en lugar de una lista de dicts
+    landing_outcomes = df_cores[['flight_number', 'name', 'date_utc', 'outcome',
+                                 'landing_success', 'landing_type', 'core_id']]
+    
+    # Contar resultados: un bincount sobre los códigos; orden descendente y, en empates,
+    # por primera aparición (igual que value_counts)
+    counts = np.bincount(outcome_codes, minlength=len(outcome_names))
+    presentes, primera_aparicion = np.unique(outcome_codes, return_index=True)
+    orden = presentes[np.lexsort((primera_aparicion, -counts[presentes]))]
+    outcome_counts = pd.Series(counts[orden], index=[outcome_names[code] for code in orden], name='count')
     
     print(f"✅ Resultados de aterrizaje encontrados: {len(landing_outcomes)}")
     
@@ -117,22 +90,24 @@ def mostrar_ranking_resultados(landing_outcomes, outcome_counts):
     print(f"\n📋 DETAILED BREAKDOWN BY OUTCOME:")
     print("-" * 80)
     
+    # Un solo groupby reparte las filas por resultado (sin filtrar la tabla por cada uno)
+    grupos = landing_outcomes.groupby('outcome', sort=False, observed=True)
     for outcome in outcome_counts.index:
-        matching_outcomes = [lo for lo in landing_outcomes if lo['outcome'] == outcome]
+        matching_outcomes = grupos.get_group(outcome)
         print(f"\n{outcome} ({len(matching_outcomes)} occurrences):")
         
-        for i, outcome_detail in enumerate(matching_outcomes[:5], 1):  # Mostrar primeros 5
-            success_icon = "✅" if outcome_detail['landing_success'] else "❌"
-            print(f"  {i}. Flight #{outcome_detail['flight_number']} - {outcome_detail['name']} {success_icon}")
-            print(f"     Date: {outcome_detail['date_utc'].strftime('%Y-%m-%d')}")
-            print(f"     Landing Type: {outcome_detail['landing_type']}")
+        for i, outcome_detail in enumerate(matching_outcomes.head(5).itertuples(index=False), 1):  # Mostrar primeros 5
+            success_icon = "✅" if outcome_detail.landing_success else "❌"
+            print(f"  {i}. Flight #{outcome_detail.flight_number} - {outcome_detail.name} {success_icon}")
+            print(f"     Date: {outcome_detail.date_utc.strftime('%Y-%m-%d')}")
+            print(f"     Landing Type: {outcome_detail.landing_type}")
         
         if len(matching_outcomes) > 5:
             print(f"     ... and {len(matching_outcomes) - 5} more")
     
     # Estadísticas adicionales
     total_attempts = len(landing_outcomes)
-    successful_attempts = sum(1 for outcome in landing_outcomes if outcome['landing_success'])
+    successful_attempts = int(landing_outcomes['landing_success'].astype(bool).sum())
     failed_attempts = total_attempts - successful_attempts
     
     print(f"\n📈 SUMMARY STATISTICS:")
@@ -141,8 +116,7 @@ def mostrar_ranking_resultados(landing_outcomes, outcome_counts):
     print(f"   Failed landings: {failed_attempts} ({(failed_attempts/total_attempts)*100:.1f}%)")
     
     # Análisis por tipo de aterrizaje
-    landing_types = [outcome['landing_type'] for outcome in landing_outcomes]
-    type_counts = pd.Series(landing_types).value_counts()
+    type_counts = landing_outcomes['landing_type'].value_counts()
     
     print(f"\n🏗️ LANDING TYPE DISTRIBUTION:")
     for landing_type, count in type_counts.items():
@@ -153,51 +127,51 @@ def grafica_ranking_resultados(outcome_counts):
     Crea gráfica del ranking de resultados de aterrizaje
     """
     print("Creando gráfica del ranking de resultados de aterrizaje...")
+    plt = importar_pyplot()
     
-    plt.figure(figsize=(16, 10))
+    fig, axes = plt.subplots(2, 2, figsize=(16, 10))
     
     # Gráfica 1: Ranking de resultados
-    plt.subplot(2, 2, 1)
+    ax = axes.flat[0]
     colors = plt.cm.viridis(np.linspace(0, 1, len(outcome_counts)))
-    bars = plt.bar(range(len(outcome_counts)), outcome_counts.values, color=colors, alpha=0.7)
-    plt.xlabel('Landing Outcome', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Occurrences', fontsize=12, fontweight='bold')
-    plt.title('Landing Outcomes Ranking\n(2010-06-04 to 2017-03-20)', fontsize=14, fontweight='bold')
-    plt.xticks(range(len(outcome_counts)), outcome_counts.index, rotation=45, ha='right')
-    plt.grid(axis='y', alpha=0.3)
+    bars = ax.bar(range(len(outcome_counts)), outcome_counts.values, color=colors, alpha=0.7)
+    ax.set_xlabel('Landing Outcome', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Occurrences', fontsize=12, fontweight='bold')
+    ax.set_title('Landing Outcomes Ranking\n(2010-06-04 to 2017-03-20)', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(len(outcome_counts)), outcome_counts.index, rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3)
     
     # Agregar valores en las barras
-    for i, (bar, count) in enumerate(zip(bars, outcome_counts.values)):
-        plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.1,
-                str(count), ha='center', va='bottom', fontweight='bold')
+    ax.bar_label(bars, labels=[str(count) for count in outcome_counts.values],
+                 padding=3, fontweight='bold')
     
     # Gráfica 2: Distribución porcentual
-    plt.subplot(2, 2, 2)
+    ax = axes.flat[1]
     colors = plt.cm.Set3(np.linspace(0, 1, len(outcome_counts)))
-    plt.pie(outcome_counts.values, labels=outcome_counts.index, autopct='%1.1f%%', 
-            colors=colors, startangle=90)
-    plt.title('Landing Outcomes Distribution', fontsize=14, fontweight='bold')
+    ax.pie(outcome_counts.values, labels=outcome_counts.index, autopct='%1.1f%%', 
+           colors=colors, startangle=90)
+    ax.set_title('Landing Outcomes Distribution', fontsize=14, fontweight='bold')
     
     # Gráfica 3: Comparación éxito vs fallo
-    plt.subplot(2, 2, 3)
+    ax = axes.flat[2]
     success_outcomes = [count for outcome, count in outcome_counts.items() if 'Success' in outcome]
     failure_outcomes = [count for outcome, count in outcome_counts.items() if 'Failure' in outcome]
     
     total_success = sum(success_outcomes)
     total_failure = sum(failure_outcomes)
     
-    plt.bar(['Success', 'Failure'], [total_success, total_failure], 
-            color=['#2ca02c', '#d62728'], alpha=0.7)
-    plt.ylabel('Number of Occurrences', fontsize=12, fontweight='bold')
-    plt.title('Success vs Failure Comparison', fontsize=14, fontweight='bold')
-    plt.grid(axis='y', alpha=0.3)
+    ax.bar(['Success', 'Failure'], [total_success, total_failure], 
+           color=['#2ca02c', '#d62728'], alpha=0.7)
+    ax.set_ylabel('Number of Occurrences', fontsize=12, fontweight='bold')
+    ax.set_title('Success vs Failure Comparison', fontsize=14, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
     
     # Agregar valores en las barras
-    plt.text(0, total_success + 0.5, str(total_success), ha='center', va='bottom', fontweight='bold')
-    plt.text(1, total_failure + 0.5, str(total_failure), ha='center', va='bottom', fontweight='bold')
+    ax.text(0, total_success + 0.5, str(total_success), ha='center', va='bottom', fontweight='bold')
+    ax.text(1, total_failure + 0.5, str(total_failure), ha='center', va='bottom', fontweight='bold')
     
     # Gráfica 4: Análisis por tipo de aterrizaje
-    plt.subplot(2, 2, 4)
+    ax = axes.flat[3]
     landing_types = []
     for outcome in outcome_counts.index:
         if 'ground pad' in outcome:
@@ -209,15 +183,17 @@ def grafica_ranking_resultados(outcome_counts):
         else:
             landing_types.append('Other')
     
-    type_analysis = pd.Series(landing_types).value_counts()
+    # A lo sumo cuatro tipos: Counter basta, sin construir una Series para contarlos
+    type_analysis = Counter(landing_types).most_common()
     colors = plt.cm.Pastel1(np.linspace(0, 1, len(type_analysis)))
-    plt.bar(type_analysis.index, type_analysis.values, color=colors, alpha=0.7)
-    plt.xlabel('Landing Type', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Outcomes', fontsize=12, fontweight='bold')
-    plt.title('Outcomes by Landing Type', fontsize=14, fontweight='bold')
-    plt.grid(axis='y', alpha=0.3)
-    
-    plt.tight_layout()
+    ax.bar([landing_type for landing_type, _ in type_analysis], [count for _, count in type_analysis],
+           color=colors, alpha=0.7)
+    ax.set_xlabel('Landing Type', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Outcomes', fontsize=12, fontweight='bold')
+    ax.set_title('Outcomes by Landing Type', fontsize=14, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
+    
+    fig.tight_layout()
     plt.show()
 
 def main():
@@ -238,8 +214,9 @@ def main():
     # 3. Mostrar ranking
     mostrar_ranking_resultados(landing_outcomes, outcome_counts)
     
-    # 4. Crear visualización
-    grafica_ranking_resultados(outcome_counts)
+    # 4. Crear visualización (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        grafica_ranking_resultados(outcome_counts)
     
     print("\n✅ Análisis completado exitosamente!")
 
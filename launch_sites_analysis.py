@@ -3,47 +3,17 @@ SpaceX EDA - Launch Sites Analysis
 Find all unique launch site names from SpaceX launches
 """
 
-import requests
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+from spacex_client import obtener_datos_spacex, precargar, limpiar_cache, obtener_por_id
+from spacex_enrich import enrich_with_launchpads
+from spacex_plot import importar_pyplot, paleta
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_launchpads():
-    """
-    Obtiene datos de launchpads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/launchpads')
-        response.raise_for_status()
-        launchpads = response.json()
-        return {launchpad['id']: launchpad for launchpad in launchpads}
-    except:
-        return {}
+# Campos de cada lanzamiento que se piden a la API (el resto de la respuesta no se descarga);
+# la misma tupla en los scripts de sitios comparte la consulta cacheada
+LAUNCH_FIELDS = ('flight_number', 'name', 'date_utc', 'launchpad', 'success')
 
 def analizar_sitios_lanzamiento(launches):
     """
@@ -53,37 +23,15 @@ def analizar_sitios_lanzamiento(launches):
     
     # Obtener datos de launchpads
     print("Obteniendo datos de launchpads...")
-    launchpads_data = obtener_datos_launchpads()
-    
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
-    
-    # Extraer información de sitios de lanzamiento
-    def extraer_launchpad_info(launchpad_id):
-        """Extrae información del launchpad"""
-        if launchpad_id and launchpad_id in launchpads_data:
-            return launchpads_data[launchpad_id]
-        return None
-    
-    # Crear nuevas columnas
-    df['launchpad_info'] = df['launchpad'].apply(extraer_launchpad_info)
-    
-    # Extraer nombres de sitios
-    df['launch_site_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_full_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('full_name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_locality'] = df['launchpad_info'].apply(
-        lambda x: x.get('locality', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_region'] = df['launchpad_info'].apply(
-        lambda x: x.get('region', 'Unknown') if x else 'Unknown'
-    )
+    launchpads_data = obtener_por_id('launchpads')
+    
+    # Convertir a DataFrame con los atributos del sitio de lanzamiento
+    df = enrich_with_launchpads(launches, launchpads_data)
     
     # Filtrar datos válidos
     df_clean = df[df['launch_site_name'] != 'Unknown'].copy()
+    # Pocos sitios distintos: como categoría, agrupar y contar usa códigos enteros
+    df_clean['launch_site_name'] = df_clean['launch_site_name'].astype('category')
     
     print(f"✅ Datos procesados: {len(df_clean)} lanzamientos con sitios válidos")
     
@@ -98,9 +46,12 @@ def mostrar_sitios_unicos(df):
     print("="*80)
     
     # Obtener sitios únicos
-    sitios_unicos = df.groupby(['launch_site_name', 'launch_site_full_name', 'launch_site_locality', 'launch_site_region']).size().reset_index()
+    # Una agrupación cuenta y ordena de mayor a menor, con empates en orden de aparición (como
+    # value_counts); observed=True evita combinaciones de sitio inexistentes de la categoría
+    columnas = ['launch_site_name', 'launch_site_full_name', 'launch_site_locality', 'launch_site_region']
+    sitios_unicos = (df.groupby(columnas, observed=True, sort=False).size()
+                     .sort_values(ascending=False, kind='stable').reset_index(name='Launch Count'))
     sitios_unicos.columns = ['Site Name', 'Full Name', 'Locality', 'Region', 'Launch Count']
-    sitios_unicos = sitios_unicos.sort_values('Launch Count', ascending=False)
     
     print(f"\n📊 Total Unique Launch Sites: {len(sitios_unicos)}")
     print(f"🚀 Total Launches Analyzed: {len(df)}")
@@ -108,11 +59,12 @@ def mostrar_sitios_unicos(df):
     print("\n📍 LAUNCH SITES DETAILS:")
     print("-" * 80)
     
-    for i, (_, row) in enumerate(sitios_unicos.iterrows(), 1):
-        print(f"{i:2d}. {row['Site Name']}")
-        print(f"    Full Name: {row['Full Name']}")
-        print(f"    Location: {row['Locality']}, {row['Region']}")
-        print(f"    Total Launches: {row['Launch Count']}")
+    for i, (site_name, full_name, locality, region, launch_count) in enumerate(
+            sitios_unicos.itertuples(index=False, name=None), 1):
+        print(f"{i:2d}. {site_name}")
+        print(f"    Full Name: {full_name}")
+        print(f"    Location: {locality}, {region}")
+        print(f"    Total Launches: {launch_count}")
         print()
     
     return sitios_unicos
@@ -122,13 +74,14 @@ def grafica_sitios_lanzamiento(df, sitios_unicos):
     Crea gráfica de barras: Launch Sites Distribution
     """
     print("Creando gráfica: Launch Sites Distribution...")
+    plt = importar_pyplot()
     
-    plt.figure(figsize=(16, 10))
+    fig = plt.figure(figsize=(16, 10))
     
     # Crear gráfica de barras
     bars = plt.bar(range(len(sitios_unicos)), 
                    sitios_unicos['Launch Count'], 
-                   color=plt.cm.viridis(np.linspace(0, 1, len(sitios_unicos))))
+                   color=paleta('viridis', len(sitios_unicos)))
     
     # Personalizar gráfica
     plt.xlabel('Launch Site', fontsize=12, fontweight='bold')
@@ -140,22 +93,27 @@ def grafica_sitios_lanzamiento(df, sitios_unicos):
     plt.xticks(range(len(sitios_unicos)), sitios_unicos['Site Name'], rotation=45, ha='right')
     
     # Agregar valores en las barras
-    for i, (bar, count) in enumerate(zip(bars, sitios_unicos['Launch Count'])):
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                f'{count}', 
-                ha='center', va='bottom', fontsize=10, fontweight='bold')
+    plt.gca().bar_label(bars, labels=[f'{count}' for count in sitios_unicos['Launch Count']],
+                        padding=3, fontsize=10, fontweight='bold')
     
     plt.grid(axis='y', alpha=0.3)
     plt.tight_layout()
-    plt.show()
-    
-    # Estadísticas adicionales
+    if plt.get_backend().lower() == 'agg':
+        fig.savefig('spacex_launch_sites_distribution.png', dpi=100, bbox_inches='tight')
+        print(f"   Gráfica guardada como: spacex_launch_sites_distribution.png")
+    else:
+        plt.show()
+    plt.close(fig)
+
+def mostrar_estadisticas_sitios(sitios_unicos):
+    """
+    Muestra el porcentaje de lanzamientos de cada sitio
+    """
     print("\n📈 Launch Site Statistics:")
     total_launches = sitios_unicos['Launch Count'].sum()
-    for _, row in sitios_unicos.iterrows():
-        percentage = (row['Launch Count'] / total_launches) * 100
-        print(f"{row['Site Name']}: {row['Launch Count']} launches ({percentage:.1f}%)")
+    for site_name, launch_count in zip(sitios_unicos['Site Name'], sitios_unicos['Launch Count']):
+        percentage = (launch_count / total_launches) * 100
+        print(f"{site_name}: {launch_count} launches ({percentage:.1f}%)")
 
 def main():
     """
@@ -164,8 +122,13 @@ def main():
     print("🚀 SPACEX LAUNCH SITES ANALYSIS")
     print("="*50)
     
-    # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    # --clear-cache descarta las respuestas guardadas y fuerza una descarga nueva
+    if '--clear-cache' in sys.argv:
+        limpiar_cache()
+    
+    # 1. Obtener datos (lanzamientos y launchpads se descargan en paralelo)
+    precargar(('launches', LAUNCH_FIELDS), 'launchpads')
+    launches = obtener_datos_spacex(LAUNCH_FIELDS)
     if launches is None:
         return
     
@@ -178,8 +141,12 @@ def main():
     # 3. Mostrar sitios únicos
     sitios_unicos = mostrar_sitios_unicos(df)
     
-    # 4. Crear visualización
-    grafica_sitios_lanzamiento(df, sitios_unicos)
+    # 4. Crear visualización (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        grafica_sitios_lanzamiento(df, sitios_unicos)
+    
+    # 5. Estadísticas adicionales
+    mostrar_estadisticas_sitios(sitios_unicos)
     
     print("\n✅ Análisis completado exitosamente!")
     print("🎯 Todos los sitios de lanzamiento únicos han sido identificados")
@@ -3,77 +3,44 @@ SpaceX EDA - Launch Sites Pattern Search
 Find records where launch sites begin with specific patterns
 """
 
-import requests
+import sys
 import pandas as pd
+from spacex_client import obtener_datos_spacex, precargar, limpiar_cache, obtener_por_id
+from spacex_enrich import enrich_with_launchpads
 import warnings
 warnings.filterwarnings('ignore')
 
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
+# Campos de cada lanzamiento que se piden a la API (el resto de la respuesta no se descarga);
+# la misma tupla en los scripts de sitios comparte la consulta cacheada
+LAUNCH_FIELDS = ('flight_number', 'name', 'date_utc', 'launchpad', 'success')
 
-def obtener_datos_launchpads():
+def preparar_sitios(launches, patterns):
     """
-    Obtiene datos de launchpads desde la API de SpaceX
+    Une lanzamientos y launchpads una sola vez y conserva solo los sitios que
+    comienzan con alguno de los patrones
     """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/launchpads')
-        response.raise_for_status()
-        launchpads = response.json()
-        return {launchpad['id']: launchpad for launchpad in launchpads}
-    except:
-        return {}
+    # Obtener datos de launchpads
+    launchpads_data = obtener_por_id('launchpads')
+    
+    # Convertir a DataFrame con los atributos del sitio de lanzamiento
+    df = enrich_with_launchpads(launches, launchpads_data)
+    
+    # Un solo startswith con la tupla de patrones reduce la tabla antes de separar por patrón
+    df_sitios = df[df['launch_site_name'].str.startswith(tuple(patterns), na=False)].copy()
+    
+    # Fechas a datetime64 una sola vez para todos los patrones: sin recortar cadenas por fila
+    # y con min/max cronológicos
+    df_sitios['date_utc'] = pd.to_datetime(df_sitios['date_utc'], format='ISO8601', utc=True, cache=True)
+    return df_sitios
 
-def buscar_sitios_patron(launches, pattern):
+def buscar_sitios_patron(df_sitios, pattern):
     """
     Busca sitios de lanzamiento que comiencen con un patrón específico
     """
     print(f"Buscando sitios de lanzamiento que comiencen con '{pattern}'...")
     
-    # Obtener datos de launchpads
-    launchpads_data = obtener_datos_launchpads()
-    
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
-    
-    # Extraer información de sitios de lanzamiento
-    def extraer_launchpad_info(launchpad_id):
-        """Extrae información del launchpad"""
-        if launchpad_id and launchpad_id in launchpads_data:
-            return launchpads_data[launchpad_id]
-        return None
-    
-    # Crear nuevas columnas
-    df['launchpad_info'] = df['launchpad'].apply(extraer_launchpad_info)
-    df['launch_site_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_full_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('full_name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_locality'] = df['launchpad_info'].apply(
-        lambda x: x.get('locality', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_region'] = df['launchpad_info'].apply(
-        lambda x: x.get('region', 'Unknown') if x else 'Unknown'
-    )
-    
     # Filtrar sitios que comiencen con el patrón
-    df_pattern = df[df['launch_site_name'].str.startswith(pattern, na=False)].copy()
+    df_pattern = df_sitios[df_sitios['launch_site_name'].str.startswith(pattern, na=False)].copy()
     
     print(f"✅ Sitios encontrados que comienzan con '{pattern}': {len(df_pattern)}")
     
@@ -103,20 +70,20 @@ def mostrar_resultados(df_pattern, pattern):
     print("-" * 80)
     
     # Mostrar los primeros 5 registros
-    for i, (_, row) in enumerate(df_pattern.head(5).iterrows(), 1):
-        print(f"\n{i}. Flight #{row['flight_number']} - {row['name']}")
-        print(f"   Launch Date: {row['date_utc'][:10]}")
-        print(f"   Launch Site: {row['launch_site_name']}")
-        print(f"   Full Name: {row['launch_site_full_name']}")
-        print(f"   Location: {row['launch_site_locality']}, {row['launch_site_region']}")
-        print(f"   Success: {'✅ Yes' if row['success'] else '❌ No'}")
+    for i, row in enumerate(df_pattern.head(5).itertuples(index=False), 1):
+        print(f"\n{i}. Flight #{row.flight_number} - {row.name}")
+        print(f"   Launch Date: {row.date_utc.date()}")
+        print(f"   Launch Site: {row.launch_site_name}")
+        print(f"   Full Name: {row.launch_site_full_name}")
+        print(f"   Location: {row.launch_site_locality}, {row.launch_site_region}")
+        print(f"   Success: {'✅ Yes' if row.success else '❌ No'}")
         print("-" * 80)
     
     # Estadísticas adicionales
     print(f"\n📈 Statistics:")
     print(f"   Total launches from '{pattern}' sites: {len(df_pattern)}")
     print(f"   Success rate: {df_pattern['success'].mean():.1%}")
-    print(f"   Date range: {df_pattern['date_utc'].min()[:10]} to {df_pattern['date_utc'].max()[:10]}")
+    print(f"   Date range: {df_pattern['date_utc'].min().date().isoformat()} to {df_pattern['date_utc'].max().date().isoformat()}")
 
 def main():
     """
@@ -125,24 +92,30 @@ def main():
     print("🚀 SPACEX LAUNCH SITES PATTERN SEARCH")
     print("="*50)
     
-    # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    # --clear-cache descarta las respuestas guardadas y fuerza una descarga nueva
+    if '--clear-cache' in sys.argv:
+        limpiar_cache()
+    
+    # 1. Obtener datos (lanzamientos y launchpads se descargan en paralelo)
+    precargar(('launches', LAUNCH_FIELDS), 'launchpads')
+    launches = obtener_datos_spacex(LAUNCH_FIELDS)
     if launches is None:
         return
+    df_sitios = preparar_sitios(launches, ('CCA', 'CCSFS', 'KSC'))
     
     # 2. Buscar sitios que comiencen con 'CCA' (no existen)
     print("\n🔍 Searching for sites beginning with 'CCA':")
-    df_cca = buscar_sitios_patron(launches, 'CCA')
+    df_cca = buscar_sitios_patron(df_sitios, 'CCA')
     mostrar_resultados(df_cca, 'CCA')
     
     # 3. Buscar sitios que comiencen con 'CCSFS' (existen)
     print("\n🔍 Searching for sites beginning with 'CCSFS':")
-    df_ccsfs = buscar_sitios_patron(launches, 'CCSFS')
+    df_ccsfs = buscar_sitios_patron(df_sitios, 'CCSFS')
     mostrar_resultados(df_ccsfs, 'CCSFS')
     
     # 4. Buscar sitios que comiencen con 'KSC' (existen)
     print("\n🔍 Searching for sites beginning with 'KSC':")
-    df_ksc = buscar_sitios_patron(launches, 'KSC')
+    df_ksc = buscar_sitios_patron(df_sitios, 'KSC')
     mostrar_resultados(df_ksc, 'KSC')
     
     print("\n✅ Análisis completado exitosamente!")
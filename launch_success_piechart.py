@@ -3,47 +3,18 @@ SpaceX EDA - Launch Success Count for All Sites (Pie Chart)
 Create a pie chart showing launch success count for all launch sites
 """
 
-import requests
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from spacex_client import obtener_datos_spacex, precargar, limpiar_cache, obtener_por_id
+from spacex_enrich import enrich_with_launchpads
+from spacex_plot import importar_pyplot, paleta
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar el estilo de las gráficas
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_launchpads():
-    """
-    Obtiene datos de launchpads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/launchpads')
-        response.raise_for_status()
-        launchpads = response.json()
-        return {launchpad['id']: launchpad for launchpad in launchpads}
-    except:
-        return {}
+# Campos de cada lanzamiento que se piden a la API (el resto de la respuesta no se descarga);
+# la misma tupla en los scripts de sitios comparte la consulta cacheada
+LAUNCH_FIELDS = ('flight_number', 'name', 'date_utc', 'launchpad', 'success')
 
 def analizar_exito_por_sitio(launches):
     """
@@ -53,44 +24,28 @@ def analizar_exito_por_sitio(launches):
     
     # Obtener datos de launchpads
     print("Obteniendo datos de launchpads...")
-    launchpads_data = obtener_datos_launchpads()
-    
-    # Convertir a DataFrame
-    df = pd.DataFrame(launches)
-    
-    # Extraer información de sitios de lanzamiento
-    def extraer_launchpad_info(launchpad_id):
-        """Extrae información del launchpad"""
-        if launchpad_id and launchpad_id in launchpads_data:
-            return launchpads_data[launchpad_id]
-        return None
-    
-    # Crear nuevas columnas
-    df['launchpad_info'] = df['launchpad'].apply(extraer_launchpad_info)
-    df['launch_site_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_full_name'] = df['launchpad_info'].apply(
-        lambda x: x.get('full_name', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_locality'] = df['launchpad_info'].apply(
-        lambda x: x.get('locality', 'Unknown') if x else 'Unknown'
-    )
-    df['launch_site_region'] = df['launchpad_info'].apply(
-        lambda x: x.get('region', 'Unknown') if x else 'Unknown'
-    )
+    launchpads_data = obtener_por_id('launchpads')
+    
+    # Convertir a DataFrame con los atributos del sitio de lanzamiento
+    df = enrich_with_launchpads(launches, launchpads_data)
     df['success'] = df['success'].astype(bool)
     
     # Filtrar datos válidos
     df_clean = df[df['launch_site_name'] != 'Unknown'].copy()
+    # Pocos sitios distintos: como categoría, agrupar y contar usa códigos enteros
+    df_clean['launch_site_name'] = df_clean['launch_site_name'].astype('category')
     
     print(f"✅ Lanzamientos con sitios válidos: {len(df_clean)}")
     
     # Calcular éxito por sitio
-    site_success = df_clean.groupby('launch_site_name')['success'].agg(['sum', 'count']).reset_index()
-    site_success.columns = ['launch_site', 'successful_launches', 'total_launches']
-    site_success['success_rate'] = (site_success['successful_launches'] / site_success['total_launches']) * 100
-    site_success = site_success.sort_values('successful_launches', ascending=False)
+    # Una sola agregación con nombre; los fallidos se calculan aquí una vez para
+    # las estadísticas y la gráfica. En empates se ordena por nombre de sitio
+    site_success = (df_clean.groupby('launch_site_name', sort=False, observed=True)
+                    .agg(successful_launches=('success', 'sum'), total_launches=('success', 'size'))
+                    .rename_axis('launch_site').reset_index()
+                    .assign(failed_launches=lambda d: d['total_launches'] - d['successful_launches'],
+                            success_rate=lambda d: d['successful_launches'] / d['total_launches'] * 100)
+                    .sort_values(['successful_launches', 'launch_site'], ascending=[False, True]))
     
     return site_success, df_clean
 
@@ -99,18 +54,19 @@ def crear_pie_chart_exito(site_success):
     Crea gráfica de pastel del éxito de lanzamientos por sitio
     """
     print("Creando gráfica de pastel del éxito de lanzamientos...")
+    plt = importar_pyplot()
     
-    plt.figure(figsize=(16, 12))
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12), constrained_layout=True)
     
     # Gráfica 1: Número de lanzamientos exitosos por sitio
-    plt.subplot(2, 2, 1)
-    colors = plt.cm.Set3(np.linspace(0, 1, len(site_success)))
-    wedges, texts, autotexts = plt.pie(site_success['successful_launches'], 
-                                       labels=site_success['launch_site'],
-                                       autopct='%1.1f%%',
-                                       colors=colors,
-                                       startangle=90)
-    plt.title('Successful Launches by Site\n(Pie Chart)', fontsize=14, fontweight='bold')
+    ax = axes.flat[0]
+    colors = paleta('Set3', len(site_success))
+    wedges, texts, autotexts = ax.pie(site_success['successful_launches'], 
+                                      labels=site_success['launch_site'],
+                                      autopct='%1.1f%%',
+                                      colors=colors,
+                                      startangle=90)
+    ax.set_title('Successful Launches by Site\n(Pie Chart)', fontsize=14, fontweight='bold')
     
     # Mejorar la legibilidad
     for autotext in autotexts:
@@ -119,67 +75,55 @@ def crear_pie_chart_exito(site_success):
         autotext.set_fontsize(10)
     
     # Gráfica 2: Tasa de éxito por sitio
-    plt.subplot(2, 2, 2)
-    colors = plt.cm.viridis(np.linspace(0, 1, len(site_success)))
-    bars = plt.bar(range(len(site_success)), site_success['success_rate'], color=colors, alpha=0.7)
-    plt.xlabel('Launch Site', fontsize=12, fontweight='bold')
-    plt.ylabel('Success Rate (%)', fontsize=12, fontweight='bold')
-    plt.title('Success Rate by Launch Site', fontsize=14, fontweight='bold')
-    plt.xticks(range(len(site_success)), site_success['launch_site'], rotation=45, ha='right')
-    plt.grid(axis='y', alpha=0.3)
+    ax = axes.flat[1]
+    colors = paleta('viridis', len(site_success))
+    bars = ax.bar(range(len(site_success)), site_success['success_rate'], color=colors, alpha=0.7)
+    ax.set_xlabel('Launch Site', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Success Rate (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Success Rate by Launch Site', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(len(site_success)), site_success['launch_site'], rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3)
     
     # Agregar valores en las barras
-    for i, (bar, rate) in enumerate(zip(bars, site_success['success_rate'])):
-        plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
-                f'{rate:.1f}%', ha='center', va='bottom', fontweight='bold')
+    ax.bar_label(bars, labels=[f'{rate:.1f}%' for rate in site_success['success_rate']],
+                 padding=3, fontweight='bold')
     
     # Gráfica 3: Comparación de lanzamientos totales vs exitosos
-    plt.subplot(2, 2, 3)
+    ax = axes.flat[2]
     x = np.arange(len(site_success))
     width = 0.35
     
-    bars1 = plt.bar(x - width/2, site_success['successful_launches'], width, 
-                   label='Successful', color='#2ca02c', alpha=0.7)
-    bars2 = plt.bar(x + width/2, site_success['total_launches'], width, 
-                   label='Total', color='#1f77b4', alpha=0.7)
-    
-    plt.xlabel('Launch Site', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Launches', fontsize=12, fontweight='bold')
-    plt.title('Successful vs Total Launches by Site', fontsize=14, fontweight='bold')
-    plt.xticks(x, site_success['launch_site'], rotation=45, ha='right')
-    plt.legend()
-    plt.grid(axis='y', alpha=0.3)
-    
-    # Gráfica 4: Distribución porcentual de lanzamientos exitosos
-    plt.subplot(2, 2, 4)
-    # Crear datos para mostrar tanto exitosos como fallidos
-    site_data = []
-    for _, row in site_success.iterrows():
-        site_data.append(f"{row['launch_site']}\n({row['successful_launches']} successful)")
-    
-    failed_launches = site_success['total_launches'] - site_success['successful_launches']
-    
-    # Crear gráfica de pastel con éxito y fallo
-    success_data = site_success['successful_launches'].values
-    failure_data = failed_launches.values
-    
-    # Combinar datos para mostrar éxito vs fallo por sitio
-    combined_data = []
-    combined_labels = []
-    for i, site in enumerate(site_success['launch_site']):
-        combined_data.extend([success_data[i], failure_data[i]])
-        combined_labels.extend([f"{site}\n(Success)", f"{site}\n(Failure)"])
-    
-    colors = []
-    for i in range(len(site_success)):
-        colors.extend(['#2ca02c', '#d62728'])  # Verde para éxito, rojo para fallo
-    
-    plt.pie(combined_data, labels=combined_labels, autopct='%1.1f%%', 
-            colors=colors, startangle=90)
-    plt.title('Success vs Failure by Site', fontsize=14, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.show()
+    bars1 = ax.bar(x - width/2, site_success['successful_launches'], width, 
+                  label='Successful', color='#2ca02c', alpha=0.7)
+    bars2 = ax.bar(x + width/2, site_success['total_launches'], width, 
+                  label='Total', color='#1f77b4', alpha=0.7)
+    
+    ax.set_xlabel('Launch Site', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Launches', fontsize=12, fontweight='bold')
+    ax.set_title('Successful vs Total Launches by Site', fontsize=14, fontweight='bold')
+    ax.set_xticks(x, site_success['launch_site'], rotation=45, ha='right')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    
+    # Gráfica 4: Éxito vs fallo por sitio como barras horizontales apiladas
+    # (dos colecciones de barras en lugar de un pastel con dos porciones por sitio)
+    ax = axes.flat[3]
+    sites = site_success['launch_site'].astype(str)
+    ax.barh(sites, site_success['successful_launches'], color='#2ca02c', alpha=0.7, label='Success')
+    ax.barh(sites, site_success['failed_launches'], left=site_success['successful_launches'],
+            color='#d62728', alpha=0.7, label='Failure')
+    ax.set_xlabel('Number of Launches', fontsize=12, fontweight='bold')
+    ax.set_title('Success vs Failure by Site', fontsize=14, fontweight='bold')
+    ax.invert_yaxis()  # mismo orden que las demás gráficas, de arriba abajo
+    ax.legend()
+    ax.grid(axis='x', alpha=0.3)
+    
+    if plt.get_backend().lower() == 'agg':
+        fig.savefig('spacex_launch_success_by_site.png', dpi=100, bbox_inches='tight')
+        print(f"   Gráfica guardada como: spacex_launch_success_by_site.png")
+    else:
+        plt.show()
+    plt.close(fig)
 
 def mostrar_estadisticas_sitios(site_success):
     """
@@ -197,7 +141,7 @@ def mostrar_estadisticas_sitios(site_success):
         print(f"  Successful Launches: {row['successful_launches']}")
         print(f"  Total Launches: {row['total_launches']}")
         print(f"  Success Rate: {row['success_rate']:.1f}%")
-        print(f"  Failed Launches: {row['total_launches'] - row['successful_launches']}")
+        print(f"  Failed Launches: {row['failed_launches']}")
         print("-" * 80)
     
     # Estadísticas generales
@@ -227,8 +171,13 @@ def main():
     print("🚀 SPACEX LAUNCH SUCCESS PIE CHART ANALYSIS")
     print("="*60)
     
-    # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    # --clear-cache descarta las respuestas guardadas y fuerza una descarga nueva
+    if '--clear-cache' in sys.argv:
+        limpiar_cache()
+    
+    # 1. Obtener datos (lanzamientos y launchpads se descargan en paralelo)
+    precargar(('launches', LAUNCH_FIELDS), 'launchpads')
+    launches = obtener_datos_spacex(LAUNCH_FIELDS)
     if launches is None:
         return
     
@@ -238,8 +187,9 @@ def main():
     # 3. Mostrar estadísticas
     mostrar_estadisticas_sitios(site_success)
     
-    # 4. Crear gráfica de pastel
-    crear_pie_chart_exito(site_success)
+    # 4. Crear gráfica de pastel (se omite con --no-plot)
+    if '--no-plot' not in sys.argv:
+        crear_pie_chart_exito(site_success)
     
     print("\n✅ Análisis completado exitosamente!")
 
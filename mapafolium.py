@@ -12,7 +12,27 @@ from folium import plugins
 from folium.features import DivIcon
 import requests
 import json
-import math
+
+# Mean Earth radius used for great-circle distances
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_np(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in kilometers between points given in degrees.
+    Accepts scalars or NumPy arrays (broadcast together), so many pairs are computed in one pass.
+    """
+    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    
+    a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
+    # atan2 form stays well conditioned near antipodal points; the clip keeps rounding
+    # from pushing a outside [0, 1] (sqrt of a negative number)
+    a = np.clip(a, 0.0, 1.0)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+    
+    return EARTH_RADIUS_KM * c
 
 def create_spacex_interactive_map():
     """
@@ -45,14 +65,8 @@ def create_spacex_interactive_map():
     # Create SpaceX launch DataFrame
     spacex_df = pd.DataFrame(spacex_launch_data)
     
-    # Create marker color column
-    def assign_marker_color(launch_outcome):
-        if launch_outcome == 1:
-            return 'green'
-        else:
-            return 'red'
-    
-    spacex_df['marker_color'] = spacex_df['class'].apply(assign_marker_color)
+    # Create marker color column (green = success, red = failure) in one vectorized pass
+    spacex_df['marker_color'] = np.where(spacex_df['class'].to_numpy() == 1, 'green', 'red')
     
     # NASA coordinate (approximate center of launch sites)
     nasa_coordinate = [28.573255, -80.646895]
@@ -60,24 +74,25 @@ def create_spacex_interactive_map():
     # Create the map
     site_map = folium.Map(location=nasa_coordinate, zoom_start=5)
     
-    # Add launch site markers and circles
-    for index, row in launch_sites_df.iterrows():
+    # Add launch site markers and circles (zip over the columns: no Series per row)
+    for lat, lon, site in zip(launch_sites_df['Lat'].to_numpy(), launch_sites_df['Long'].to_numpy(),
+                              launch_sites_df['Launch Site'].to_numpy()):
         # Create a Circle object for each launch site
         circle = folium.Circle(
-            [row['Lat'], row['Long']],
+            [lat, lon],
             radius=1000,
             color='#d35400',
             fill=True,
-            popup=row['Launch Site']
+            popup=site
         )
         
         # Create a Marker object for each launch site
         marker = folium.Marker(
-            [row['Lat'], row['Long']],
+            [lat, lon],
             icon=DivIcon(
                 icon_size=(20, 20),
                 icon_anchor=(0, 0),
-                html='<div style="font-size: 12; color:#d35400;"><b>%s</b></div>' % row['Launch Site'],
+                html='<div style="font-size: 12; color:#d35400;"><b>%s</b></div>' % site,
             )
         )
         
@@ -85,47 +100,43 @@ def create_spacex_interactive_map():
         site_map.add_child(circle)
         site_map.add_child(marker)
     
-    # Create marker cluster for launch outcomes
-    marker_cluster = plugins.MarkerCluster()
-    
-    # Add marker cluster to the map
+    # Launch outcome markers: one [lat, lon, color, popup] row per launch. FastMarkerCluster
+    # ships the rows as a single JS array and the callback builds each Leaflet marker in the
+    # browser (same white AwesomeMarkers icon as folium.Icon, tinted by outcome)
+    popups = [
+        f"Launch Site: {site}<br>Date: {date}<br>Outcome: {'Success' if outcome == 1 else 'Failure'}"
+        for site, date, outcome in zip(spacex_df['Launch_Site'].to_numpy(), spacex_df['Date'].to_numpy(),
+                                       spacex_df['class'].to_numpy())
+    ]
+    outcome_rows = [[lat, lon, color, popup] for (lat, lon, color), popup
+                    in zip(spacex_df[['Lat', 'Long', 'marker_color']].to_numpy().tolist(), popups)]
+    outcome_callback = """function (row) {
+        var icon = L.AwesomeMarkers.icon({
+            icon: 'info-sign', prefix: 'glyphicon', markerColor: 'white', iconColor: row[2]
+        });
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindPopup(row[3]);
+        return marker;
+    }"""
+    
+    # Create the marker cluster and add it to the map
+    marker_cluster = plugins.FastMarkerCluster(data=outcome_rows, callback=outcome_callback)
     site_map.add_child(marker_cluster)
     
-    # Add launch outcome markers
-    for index, record in spacex_df.iterrows():
-        # Create and add a Marker cluster to the site map
-        marker = folium.Marker(
-            [record['Lat'], record['Long']],
-            icon=folium.Icon(color='white', icon_color=record['marker_color']),
-            popup=f"Launch Site: {record['Launch_Site']}<br>Date: {record['Date']}<br>Outcome: {'Success' if record['class'] == 1 else 'Failure'}"
-        )
-        marker_cluster.add_child(marker)
-    
     # Add distance calculations and markers
-    def calculate_distance(lat1, lon1, lat2, lon2):
-        """Calculate distance between two points in kilometers"""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-        
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
-    
-    # Add coastline distance marker for CCAFS SLC 40
+    # Coastline and city (Cocoa Beach) points for CCAFS SLC 40
     launch_site_lat = 28.561857
     launch_site_lon = -80.577366
     coastline_lat = 28.56367
     coastline_lon = -80.57163
+    city_lat = 28.3200
+    city_lon = -80.6100
     
-    distance_coastline = calculate_distance(launch_site_lat, launch_site_lon, coastline_lat, coastline_lon)
+    # Both distances from the launch site in a single vectorized call
+    distance_coastline, distance_city = haversine_np(
+        launch_site_lat, launch_site_lon,
+        np.array([coastline_lat, city_lat]), np.array([coastline_lon, city_lon])
+    )
     
     # Create coastline distance marker
     distance_marker = folium.Marker(
@@ -145,11 +156,6 @@ def create_spacex_interactive_map():
     lines = folium.PolyLine(locations=coordinates, weight=1)
     site_map.add_child(lines)
     
-    # Add city distance marker (Cocoa Beach)
-    city_lat = 28.3200
-    city_lon = -80.6100
-    distance_city = calculate_distance(launch_site_lat, launch_site_lon, city_lat, city_lon)
-    
     # Create city marker
     city_marker = folium.Marker(
         [city_lat, city_lon],
@@ -3,11 +3,11 @@ SpaceX EDA - Boosters Carried Maximum Payload
 List the names of the booster which have carried the maximum payload mass
 """
 
-import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from spacex_client import obtener_datos_completos, obtener_por_id
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,125 +15,50 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
-def obtener_datos_payloads():
-    """
-    Obtiene datos de payloads desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/payloads')
-        response.raise_for_status()
-        payloads = response.json()
-        return {payload['id']: payload for payload in payloads}
-    except:
-        return {}
-
-def obtener_datos_rockets():
-    """
-    Obtiene datos de rockets desde la API de SpaceX
-    """
-    try:
-        response = requests.get('https://api.spacexdata.com/v4/rockets')
-        response.raise_for_status()
-        rockets = response.json()
-        return {rocket['id']: rocket for rocket in rockets}
-    except:
-        return {}
-
-def buscar_max_payload_boosters(launches):
+def buscar_max_payload_boosters(launches, payloads_data=None, rockets_data=None):
     """
     Busca los boosters que han transportado la masa máxima de payload
     """
     print("Buscando boosters con máxima masa de payload...")
     
-    # Obtener datos de payloads y rockets
-    print("Obteniendo datos de payloads y rockets...")
-    payloads_data = obtener_datos_payloads()
-    rockets_data = obtener_datos_rockets()
+    # Obtener datos de payloads y rockets si no se recibieron ya
+    if payloads_data is None or rockets_data is None:
+        print("Obteniendo datos de payloads y rockets...")
+        payloads_data = obtener_por_id('payloads') if payloads_data is None else payloads_data
+        rockets_data = obtener_por_id('rockets') if rockets_data is None else rockets_data
     
     # Convertir a DataFrame
     df = pd.DataFrame(launches)
-    
-    # Extraer información de payloads
-    def extraer_payload_info(payload_ids):
-        """Extrae información de todos los payloads"""
-        if not payload_ids:
-            return []
-        
-        payload_info = []
-        for payload_id in payload_ids:
-            if payload_id in payloads_data:
-                payload = payloads_data[payload_id]
-                payload_info.append({
-                    'mass_kg': payload.get('mass_kg', 0),
-                    'name': payload.get('name', 'Unknown')
-                })
-        return payload_info
-    
-    # Extraer información de rockets
-    def extraer_rocket_info(rocket_id):
-        """Extrae información del rocket"""
-        if rocket_id and rocket_id in rockets_data:
-            return rockets_data[rocket_id]
-        return None
-    
-    # Crear nuevas columnas
-    df['payload_info'] = df['payloads'].apply(extraer_payload_info)
-    df['rocket_info'] = df['rocket'].apply(extraer_rocket_info)
-    df['launch_year'] = pd.to_datetime(df['date_utc']).dt.year
     df['success'] = df['success'].astype(bool)
     
-    # Calcular masa total de payload para cada lanzamiento
-    launch_payloads = []
-    
-    for _, row in df.iterrows():
-        total_payload_mass = 0
-        payload_names = []
-        
-        for payload in row['payload_info']:
-            mass = payload.get('mass_kg', 0)
-            if mass is not None and mass > 0:
-                total_payload_mass += mass
-                payload_names.append(payload.get('name', 'Unknown'))
-        
-        if total_payload_mass > 0:
-            launch_payloads.append({
-                'flight_number': row['flight_number'],
-                'name': row['name'],
-                'date_utc': row['date_utc'],
-                'payload_mass': total_payload_mass,
-                'payload_names': payload_names,
-                'rocket_name': row['rocket_info'].get('name', 'Unknown') if row['rocket_info'] else 'Unknown',
-                'success': row['success']
-            })
+    # Una fila por (lanzamiento, payload) unida con la tabla de payloads; solo cuentan
+    # los payloads conocidos con masa positiva
+    payloads_df = pd.DataFrame(list(payloads_data.values()), columns=['id', 'mass_kg', 'name'])
+    payloads_df = payloads_df.rename(columns={'id': 'payload_id', 'name': 'payload_name'})
+    payloads_df['mass_kg'] = payloads_df['mass_kg'].astype('float64')  # None -> NaN, no cuenta
+    payloads_df['payload_name'] = payloads_df['payload_name'].fillna('Unknown')
+    launch_payload = (df['payloads'].explode().rename('payload_id').rename_axis('launch').reset_index()
+                      .merge(payloads_df, on='payload_id', how='inner'))
+    launch_payload = launch_payload[launch_payload['mass_kg'] > 0]
+    
+    # Masa total y nombres de payload por lanzamiento en una sola agregación
+    masas = launch_payload.groupby('launch').agg(payload_mass=('mass_kg', 'sum'),
+                                                 payload_names=('payload_name', list))
     
     # Encontrar la masa máxima
-    if not launch_payloads:
+    if len(masas) == 0:
         print("❌ No se encontraron datos de payload")
         return None, None
     
-    max_payload_mass = max(launch['payload_mass'] for launch in launch_payloads)
+    max_payload_mass = masas['payload_mass'].max()
     
-    # Encontrar todos los lanzamientos con la masa máxima
-    max_payload_launches = [launch for launch in launch_payloads 
-                           if launch['payload_mass'] == max_payload_mass]
+    # Todos los lanzamientos con la masa máxima (puede haber empates), en el orden de la API
+    maximos = masas[masas['payload_mass'] == max_payload_mass]
+    max_df = df.loc[maximos.index, ['flight_number', 'name', 'date_utc']].join(maximos)
+    max_df['rocket_name'] = [rockets_data.get(rocket, {}).get('name', 'Unknown')
+                             for rocket in df.loc[maximos.index, 'rocket']]
+    max_df['success'] = df.loc[maximos.index, 'success']
+    max_payload_launches = max_df.to_dict('records')
     
     print(f"✅ Masa máxima de payload encontrada: {max_payload_mass:,.2f} kg")
     print(f"✅ Lanzamientos con masa máxima: {len(max_payload_launches)}")
@@ -259,13 +184,13 @@ def main():
     print("🚀 SPACEX BOOSTERS WITH MAXIMUM PAYLOAD MASS")
     print("="*60)
     
-    # 1. Obtener datos
-    launches = obtener_datos_spacex()
+    # 1. Obtener datos (lanzamientos, payloads y rockets en paralelo)
+    launches, payloads_data, rockets_data = obtener_datos_completos('payloads', 'rockets')
     if launches is None:
         return
     
     # 2. Buscar boosters con máxima masa de payload
-    max_payload_launches, max_mass = buscar_max_payload_boosters(launches)
+    max_payload_launches, max_mass = buscar_max_payload_boosters(launches, payloads_data, rockets_data)
     
     if max_payload_launches is None:
         return
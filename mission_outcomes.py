@@ -3,11 +3,11 @@ SpaceX EDA - Total Number of Successful and Failure Mission Outcomes
 Calculate the total number of successful and failure mission outcomes
 """
 
-import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from spacex_client import obtener_datos_spacex
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,24 +15,6 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-def obtener_datos_spacex():
-    """
-    Obtiene los datos de lanzamientos desde la API de SpaceX
-    """
-    print("Obteniendo datos de la API de SpaceX...")
-    
-    url = 'https://api.spacexdata.com/v4/launches'
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        launches = response.json()
-        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
-        return launches
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error al obtener datos: {e}")
-        return None
-
 def calcular_resultados_misiones(launches):
     """
     Calcula el número total de misiones exitosas y fallidas
@@ -44,28 +26,34 @@ def calcular_resultados_misiones(launches):
     
     # Filtrar datos válidos
     df_valid = df[df['success'].notna()].copy()
+    # Año de lanzamiento una sola vez (parser ISO 8601 explícito); lo reutilizan el resumen y la gráfica
+    df_valid['year'] = pd.to_datetime(df_valid['date_utc'], format='ISO8601', utc=True, cache=True).dt.year
     
     print(f"✅ Lanzamientos con datos válidos: {len(df_valid)}")
     
-    # Calcular resultados
-    successful_missions = df_valid[df_valid['success'] == True]
-    failed_missions = df_valid[df_valid['success'] == False]
+    # Calcular resultados sobre el mismo DataFrame (sin copias separadas de éxitos y fallos)
+    is_success = (df_valid['success'] == True).to_numpy()
     
     total_missions = len(df_valid)
-    success_count = len(successful_missions)
-    failure_count = len(failed_missions)
+    success_count = int(is_success.sum())
+    failure_count = total_missions - success_count
     
     success_rate = (success_count / total_missions) * 100
     failure_rate = (failure_count / total_missions) * 100
     
+    # Resultados por año en una sola agrupación; la usan el resumen y la gráfica
+    yearly_outcomes = (df_valid.groupby(['year', 'success']).size().unstack(fill_value=0)
+                       .reindex(columns=[False, True], fill_value=0))
+    yearly_outcomes.columns = ['Failed', 'Successful']
+    
     return {
         'total_missions': total_missions,
         'successful_missions': success_count,
         'failed_missions': failure_count,
         'success_rate': success_rate,
         'failure_rate': failure_rate,
-        'successful_data': successful_missions,
-        'failed_data': failed_missions
+        'df_valid': df_valid,
+        'yearly_outcomes': yearly_outcomes
     }
 
 def mostrar_resultados_misiones(results):
@@ -84,17 +72,18 @@ def mostrar_resultados_misiones(results):
     # Mostrar algunos ejemplos de misiones exitosas
     print(f"\n✅ SUCCESSFUL MISSIONS (First 5):")
     print("-" * 80)
-    for i, (_, mission) in enumerate(results['successful_data'].head(5).iterrows(), 1):
+    df_valid = results['df_valid']
+    for i, (_, mission) in enumerate(df_valid[df_valid['success'] == True].head(5).iterrows(), 1):
         print(f"{i}. Flight #{mission['flight_number']} - {mission['name']}")
         print(f"   Date: {mission['date_utc'][:10]}")
         print(f"   Success: {'✅ Yes' if mission['success'] else '❌ No'}")
         print("-" * 80)
     
     # Mostrar algunos ejemplos de misiones fallidas
-    if len(results['failed_data']) > 0:
+    if results['failed_missions'] > 0:
         print(f"\n❌ FAILED MISSIONS (First 5):")
         print("-" * 80)
-        for i, (_, mission) in enumerate(results['failed_data'].head(5).iterrows(), 1):
+        for i, (_, mission) in enumerate(df_valid[df_valid['success'] == False].head(5).iterrows(), 1):
             print(f"{i}. Flight #{mission['flight_number']} - {mission['name']}")
             print(f"   Date: {mission['date_utc'][:10]}")
             print(f"   Success: {'✅ Yes' if mission['success'] else '❌ No'}")
@@ -103,11 +92,7 @@ def mostrar_resultados_misiones(results):
         print(f"\n❌ FAILED MISSIONS: None found")
     
     # Análisis por año
-    df_all = pd.concat([results['successful_data'], results['failed_data']])
-    df_all['year'] = pd.to_datetime(df_all['date_utc']).dt.year
-    
-    yearly_outcomes = df_all.groupby(['year', 'success']).size().unstack(fill_value=0)
-    yearly_outcomes.columns = ['Failed', 'Successful']
+    yearly_outcomes = results['yearly_outcomes']
     
     print(f"\n📅 MISSION OUTCOMES BY YEAR:")
     for year, row in yearly_outcomes.iterrows():
@@ -145,11 +130,7 @@ def grafica_resultados_misiones(results):
         plt.text(i, v + 0.5, str(v), ha='center', va='bottom', fontweight='bold')
     
     # Gráfica 3: Tasa de éxito por año
-    df_all = pd.concat([results['successful_data'], results['failed_data']])
-    df_all['year'] = pd.to_datetime(df_all['date_utc']).dt.year
-    
-    yearly_outcomes = df_all.groupby(['year', 'success']).size().unstack(fill_value=0)
-    yearly_outcomes.columns = ['Failed', 'Successful']
+    yearly_outcomes = results['yearly_outcomes'].copy()
     yearly_outcomes['Success_Rate'] = (yearly_outcomes['Successful'] / 
                                       (yearly_outcomes['Successful'] + yearly_outcomes['Failed'])) * 100
     
@@ -0,0 +1,283 @@
+"""
+SpaceX API Client
+Cliente compartido para la API de SpaceX con caché en disco
+"""
+
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Decodificadores JSON opcionales, en orden de preferencia; sin ninguno se usa json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+API_URL = 'https://api.spacexdata.com/v4'
+
+# Las respuestas se guardan comprimidas en disco y se reutilizan durante CACHE_TTL segundos
+CACHE_DIR = Path(os.environ.get('SPACEX_CACHE_DIR', Path.home() / '.cache' / 'spacex'))
+CACHE_TTL = 24 * 60 * 60
+
+# Una sola sesión reutiliza la conexión TCP/TLS entre endpoints; el pool admite las
+# descargas en paralelo y los errores transitorios del servidor se reintentan
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'spacex-eda/1.0'})
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    # POST solo se usa para las consultas de lectura de query_spacex, que se pueden repetir
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset({'GET', 'POST'}))
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+def _json_loads(raw):
+    """Decodifica JSON desde bytes (orjson o ujson si están disponibles)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if ujson is not None:
+        return ujson.loads(raw)
+    return json.loads(raw)
+
+def _json_dumps(data):
+    """Codifica JSON a bytes (orjson o ujson si están disponibles)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    if ujson is not None:
+        return ujson.dumps(data).encode('utf-8')
+    return json.dumps(data).encode('utf-8')
+
+def _ruta_cache(endpoint):
+    """Ruta del archivo de caché para un endpoint"""
+    return CACHE_DIR / f"{endpoint.strip('/').replace('/', '_')}.json.gz"
+
+# Valor de _leer_cache cuando la copia en disco no se puede usar
+_SIN_CACHE = object()
+
+def _borrar_cache(ruta):
+    """Borra la respuesta guardada en disco y su ETag"""
+    for archivo in (ruta, ruta.with_suffix('.etag')):
+        try:
+            archivo.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+def _leer_cache(ruta):
+    """
+    Lee una respuesta guardada en disco.
+    
+    Si el archivo está dañado (gzip truncado, JSON inválido) se borra junto con su ETag
+    y devuelve _SIN_CACHE, para que el llamador la descargue de nuevo.
+    """
+    try:
+        with gzip.open(ruta, 'rb') as f:
+            return _json_loads(f.read())
+    except (OSError, EOFError, ValueError):
+        _borrar_cache(ruta)
+        return _SIN_CACHE
+
+def _guardar_cache(ruta, data, etag):
+    """Guarda la respuesta (y su ETag) en disco; si no se puede escribir, solo se pierde el ahorro"""
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_name(ruta.name + '.tmp')
+        with gzip.open(tmp, 'wb') as f:
+            f.write(_json_dumps(data))
+        os.replace(tmp, ruta)
+        if etag:
+            ruta.with_suffix('.etag').write_text(etag)
+        else:
+            # Sin ETag nuevo, el anterior ya no corresponde a esta copia
+            ruta.with_suffix('.etag').unlink(missing_ok=True)
+    except OSError:
+        pass
+
+@lru_cache(maxsize=None)
+def get_spacex(endpoint, timeout=30):
+    """
+    Obtiene un endpoint de la API de SpaceX (p. ej. 'launches').
+    
+    Usa la copia en disco si tiene menos de CACHE_TTL segundos; si es más antigua,
+    la revalida con If-None-Match y un 304 evita descargar el cuerpo de nuevo.
+    Dentro del mismo proceso el resultado queda en memoria (no modificarlo).
+    """
+    ruta = _ruta_cache(endpoint)
+    ruta_etag = ruta.with_suffix('.etag')
+
+    if ruta.exists() and time.time() - ruta.stat().st_mtime < CACHE_TTL:
+        data = _leer_cache(ruta)
+        if data is not _SIN_CACHE:
+            return data
+
+    headers = {}
+    if ruta.exists() and ruta_etag.exists():
+        headers['If-None-Match'] = ruta_etag.read_text().strip()
+
+    url = f"{API_URL}/{endpoint.strip('/')}"
+    response = _SESSION.get(url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304:
+        ruta.touch()  # sin cambios: renovar el TTL de la copia local
+        data = _leer_cache(ruta)
+        if data is not _SIN_CACHE:
+            return data
+        # La copia local estaba dañada: descargar el cuerpo completo sin If-None-Match
+        response = _SESSION.get(url, timeout=timeout)
+
+    response.raise_for_status()
+    # .content (bytes) evita el paso extra de decodificar a str
+    data = _json_loads(response.content)
+    _guardar_cache(ruta, data, response.headers.get('ETag'))
+
+    return data
+
+@lru_cache(maxsize=None)
+def query_spacex(endpoint, campos, timeout=30):
+    """
+    Consulta '<endpoint>/query' pidiendo solo los campos indicados (tupla) y devuelve los documentos.
+    
+    La respuesta es mucho más pequeña que el endpoint completo. Se guarda en disco con
+    el mismo TTL que get_spacex, sin revalidación (las consultas POST no traen ETag).
+    """
+    ruta = _ruta_cache(f"{endpoint}_{'-'.join(campos)}")
+
+    if ruta.exists() and time.time() - ruta.stat().st_mtime < CACHE_TTL:
+        data = _leer_cache(ruta)
+        if data is not _SIN_CACHE:
+            return data
+
+    consulta = {'query': {}, 'options': {'select': {campo: 1 for campo in campos}, 'pagination': False}}
+    response = _SESSION.post(f"{API_URL}/{endpoint.strip('/')}/query", json=consulta, timeout=timeout)
+    response.raise_for_status()
+    respuesta = _json_loads(response.content)
+    if not isinstance(respuesta, dict) or 'docs' not in respuesta:
+        # InvalidJSONError es una RequestException: los llamadores ya la manejan
+        raise requests.exceptions.InvalidJSONError(
+            f"Respuesta de {endpoint}/query sin 'docs'", response=response)
+    data = respuesta['docs']
+    _guardar_cache(ruta, data, None)
+
+    return data
+
+def get_launches(timeout=30):
+    """Lanzamientos de SpaceX"""
+    return get_spacex('launches', timeout=timeout)
+
+def get_payloads(timeout=30):
+    """Payloads de SpaceX"""
+    return get_spacex('payloads', timeout=timeout)
+
+def get_rockets(timeout=30):
+    """Cohetes de SpaceX"""
+    return get_spacex('rockets', timeout=timeout)
+
+def get_launchpads(timeout=30):
+    """Plataformas de lanzamiento de SpaceX"""
+    return get_spacex('launchpads', timeout=timeout)
+
+@lru_cache(maxsize=1)
+def payloads_by_id(timeout=30):
+    """Payloads indexados por id (se construye una vez por proceso; no modificarlo)"""
+    return {payload['id']: payload for payload in get_payloads(timeout=timeout)}
+
+@lru_cache(maxsize=1)
+def rockets_by_id(timeout=30):
+    """Cohetes indexados por id (se construye una vez por proceso; no modificarlo)"""
+    return {rocket['id']: rocket for rocket in get_rockets(timeout=timeout)}
+
+@lru_cache(maxsize=1)
+def launchpads_by_id(timeout=30):
+    """Plataformas de lanzamiento indexadas por id (se construye una vez por proceso; no modificarlo)"""
+    return {launchpad['id']: launchpad for launchpad in get_launchpads(timeout=timeout)}
+
+def limpiar_cache():
+    """Borra las respuestas guardadas en disco y en memoria; la siguiente llamada descarga de nuevo"""
+    for funcion in (get_spacex, query_spacex, payloads_by_id, rockets_by_id, launchpads_by_id):
+        funcion.cache_clear()
+    for patron in ('*.json.gz', '*.etag'):
+        for ruta in CACHE_DIR.glob(patron):
+            try:
+                ruta.unlink()
+            except OSError:
+                pass
+
+def precargar(*endpoints, timeout=30):
+    """
+    Descarga varios endpoints en paralelo para dejarlos en la caché de get_spacex.
+    
+    Un elemento (endpoint, campos) precarga la consulta equivalente de query_spacex.
+    Los errores se ignoran aquí: la llamada posterior al endpoint los vuelve a lanzar
+    en el sitio donde cada script ya los maneja.
+    """
+    def _obtener(endpoint):
+        try:
+            if isinstance(endpoint, tuple):
+                query_spacex(*endpoint, timeout=timeout)
+            else:
+                get_spacex(endpoint, timeout=timeout)
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+
+    with ThreadPoolExecutor(max_workers=max(len(endpoints), 1)) as executor:
+        list(executor.map(_obtener, endpoints))
+
+def obtener_datos_spacex(campos=None, timeout=30):
+    """
+    Obtiene los datos de lanzamientos desde la API de SpaceX
+    
+    Compartida por los scripts de análisis: gracias a la caché de get_spacex, varias
+    llamadas en el mismo proceso hacen una sola petición. Con campos (tupla) solo se
+    descargan esos campos de cada lanzamiento, vía query_spacex. timeout se pasa siempre
+    por nombre, igual que en precargar, para que ambos usen la misma entrada de lru_cache.
+    """
+    print("Obteniendo datos de la API de SpaceX...")
+    
+    try:
+        launches = (query_spacex('launches', campos, timeout=timeout) if campos
+                    else get_launches(timeout=timeout))
+        print(f"✅ Datos obtenidos exitosamente: {len(launches)} lanzamientos")
+        return launches
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError: cuerpo JSON inválido (orjson/ujson/json no lanzan RequestException)
+        print(f"❌ Error al obtener datos: {e}")
+        return None
+
+def obtener_por_id(endpoint, timeout=30):
+    """
+    Documentos de 'payloads', 'rockets' o 'launchpads' indexados por id.
+    
+    Si la descarga falla devuelve {} y el análisis continúa sin esos datos; cualquier
+    otro error (p. ej. un documento sin 'id') se propaga.
+    """
+    por_id = {'payloads': payloads_by_id, 'rockets': rockets_by_id, 'launchpads': launchpads_by_id}
+    try:
+        return por_id[endpoint](timeout=timeout)
+    except (requests.exceptions.RequestException, ValueError):
+        return {}
+
+def obtener_datos_completos(*endpoints, timeout=30):
+    """
+    Obtiene los lanzamientos y los endpoints indicados (vía obtener_por_id) en paralelo.
+    
+    Devuelve (launches, datos_endpoint_1, datos_endpoint_2, ...) en el orden pedido.
+    """
+    with ThreadPoolExecutor(max_workers=len(endpoints) + 1) as executor:
+        futuro_launches = executor.submit(obtener_datos_spacex, timeout=timeout)
+        futuros = [executor.submit(obtener_por_id, endpoint, timeout=timeout) for endpoint in endpoints]
+    
+    return (futuro_launches.result(), *(futuro.result() for futuro in futuros))
@@ -0,0 +1,39 @@
+"""
+SpaceX Enrich
+Une los lanzamientos con los atributos de su sitio de lanzamiento (compartido por los scripts de sitios)
+"""
+
+import pandas as pd
+
+# Con pyarrow, los nombres de sitio usan las funciones de texto de Arrow (startswith,
+# comparaciones) en lugar de llamar a Python por elemento; sin él se quedan como están
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Columna de salida -> campo del documento de launchpad
+CAMPOS_SITIO = {
+    'launch_site_name': 'name',
+    'launch_site_full_name': 'full_name',
+    'launch_site_locality': 'locality',
+    'launch_site_region': 'region'
+}
+
+def enrich_with_launchpads(launches, launchpads_data, columns=None):
+    """
+    DataFrame de lanzamientos con las columnas de CAMPOS_SITIO.
+
+    launchpads_data es el dict id -> launchpad; los lanzamientos sin launchpad conocido
+    quedan con 'Unknown'. columns limita las columnas tomadas de cada lanzamiento.
+    """
+    # Una pasada sobre los lanzamientos con un acceso al dict por fila; las columnas del
+    # sitio se construyen directamente, sin tabla intermedia de launchpads ni join
+    sitios = [launchpads_data.get(launch.get('launchpad')) or {} for launch in launches]
+    df = pd.DataFrame(launches, columns=columns)
+    for columna, campo in CAMPOS_SITIO.items():
+        df[columna] = pd.array([sitio.get(campo, 'Unknown') for sitio in sitios], dtype=object)
+    if pyarrow is not None:
+        df['launch_site_name'] = df['launch_site_name'].astype('string[pyarrow]')
+
+    return df
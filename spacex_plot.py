@@ -0,0 +1,31 @@
+"""
+SpaceX Plot
+Configuración de matplotlib compartida por los scripts que grafican
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+def importar_pyplot():
+    """
+    Importa matplotlib solo al graficar, para que las ejecuciones con --no-plot no lo carguen.
+
+    Sin terminal (HEADLESS o salida redirigida) no se pueden mostrar ventanas: se usa Agg,
+    sin arrancar el backend gráfico, y cada script guarda o descarta la figura.
+    """
+    import matplotlib
+    if os.environ.get('HEADLESS') or not sys.stdout.isatty():
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    # Estilo de las gráficas ('seaborn-v0_8' viene con matplotlib; todas las gráficas usan colores explícitos)
+    plt.style.use('seaborn-v0_8')
+    return plt
+
+@lru_cache(maxsize=32)
+def paleta(nombre, n):
+    """Colores de un colormap para n elementos (se calcula una vez por combinación; no modificarlo)"""
+    from matplotlib import colormaps
+    return colormaps[nombre](np.linspace(0, 1, n))